@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark and load-test suite for PumpShield
+
+Everything runs against local aiohttp stand-ins: a Solana JSON-RPC node
+answering the methods the bot uses and the pump.fun /coins/{ca} endpoint
+serving the recorded fixtures (fixtures/pump_coins_1k.json). Telegram is
+replaced by a stub Bot API transport, so synthetic updates run through the
+real Application handlers.
+
+    python benchmark.py                                  # default profile
+    python benchmark.py --profile flaky --updates 500    # errors and hangs
+    python benchmark.py --baseline old.json              # compare with a previous run
+    python benchmark.py --record MINT ...                # re-record fixtures from PUMP_API_URL
+
+Results (p50/p95/p99 latency and throughput per command) are written as
+JSON to --output.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Keep the benchmark's databases away from the bot's; a fresh file means a cold start.
+# A short RPC timeout keeps the hang profiles quick.
+BENCH_DIR = tempfile.mkdtemp(prefix="pumpshield-bench-")
+os.environ["WALLET_DB"] = os.path.join(BENCH_DIR, "bench.db")
+os.environ["COIN_CACHE_DB"] = os.path.join(BENCH_DIR, "coin_cache.db")
+os.environ.setdefault("RPC_TIMEOUT", "2")
+
+from telegram import Update
+from telegram.ext import TypeHandler
+from telegram.request import BaseRequest, RequestData
+
+import main_user_friendly as bot
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pump_coins_1k.json")
+PORT = 18898
+BASE_URL = f"http://127.0.0.1:{PORT}"
+COMMANDS = ("balance", "rugcheck", "auto")
+
+# Upstream behaviour: base latency, jitter, share of HTTP 500s and share of requests that hang
+PROFILES = {
+    "fast": {"latency_ms": 5, "jitter_ms": 5, "error_rate": 0.0, "timeout_rate": 0.0},
+    "mainnet": {"latency_ms": 80, "jitter_ms": 120, "error_rate": 0.01, "timeout_rate": 0.0},
+    "flaky": {"latency_ms": 150, "jitter_ms": 400, "error_rate": 0.1, "timeout_rate": 0.02},
+}
+
+def load_fixtures() -> list:
+    with open(FIXTURES) as f:
+        return json.load(f)
+
+async def record_fixtures(mints: list) -> None:
+    """Fetch live coin documents for `mints` and store them as the fixtures"""
+    await bot.http_pool.start([bot.PUMP_API_URL])
+    try:
+        results = await asyncio.gather(*(bot.fetch_coin_data_live(ca) for ca in mints))
+    finally:
+        await bot.http_pool.close()
+    coins = [result["data"] for result in results if "data" in result]
+    with open(FIXTURES, "w") as f:
+        f.write("[\n" + ",\n".join(json.dumps(coin, separators=(",", ":")) for coin in coins) + "\n]\n")
+    print(f"Recorded {len(coins)}/{len(mints)} coins to {FIXTURES}")
+
+# 🧪 Local upstream stand-ins
+class StandIns:
+    """pump.fun API and Solana JSON-RPC stand-ins with a latency/error/timeout profile"""
+
+    def __init__(self, coins: list, profile: Dict[str, float], hang_s: float, seed: int = 7):
+        self.by_mint = {coin["mint"]: coin for coin in coins}
+        self.profile = profile
+        self.hang_s = hang_s
+        self.rng = random.Random(seed)
+        self.requests: Dict[str, int] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _behave(self, name: str) -> Optional[web.Response]:
+        """Apply the profile; returns an error response when this request should fail"""
+        self.requests[name] = self.requests.get(name, 0) + 1
+        if self.rng.random() < self.profile["timeout_rate"]:
+            await asyncio.sleep(self.hang_s)
+        delay = self.profile["latency_ms"] + self.rng.random() * self.profile["jitter_ms"]
+        await asyncio.sleep(delay / 1000)
+        if self.rng.random() < self.profile["error_rate"]:
+            return web.Response(status=500)
+        return None
+
+    async def coin(self, request: web.Request) -> web.Response:
+        failed = await self._behave("coins")
+        if failed:
+            return failed
+        data = self.by_mint.get(request.match_info["ca"])
+        return web.json_response(data) if data else web.Response(status=404)
+
+    async def rpc(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if body["method"] in ("getHealth", "getSlot"):
+            result = "ok" if body["method"] == "getHealth" else 1
+            return web.json_response({"jsonrpc": "2.0", "id": body["id"], "result": result})
+        failed = await self._behave(body["method"])
+        if failed:
+            return failed
+        return web.json_response({"jsonrpc": "2.0", "id": body["id"], "result": self.rpc_result(body)})
+
+    def rpc_result(self, body: Dict[str, Any]) -> Any:
+        context = {"slot": 1}
+        method = body["method"]
+        if method == "getMultipleAccounts":
+            # Wallets and token accounts do not exist yet: zero balances
+            return {"context": context, "value": [None] * len(body["params"][0])}
+        if method == "getTokenSupply":
+            return {"context": context, "value": {"amount": "1000000000000000", "decimals": 6,
+                                                  "uiAmount": 1e9, "uiAmountString": "1000000000"}}
+        if method in ("getTokenLargestAccounts", "getTokenAccountsByOwner"):
+            return {"context": context, "value": []}
+        if method == "getLatestBlockhash":
+            return {"context": context, "value": {"blockhash": "11111111111111111111111111111111",
+                                                  "lastValidBlockHeight": 1}}
+        return []  # getProgramAccounts
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/coins/{ca}", self.coin)
+        app.router.add_post("/", self.rpc)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", PORT).start()
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+class StubBotRequest(BaseRequest):
+    """Bot API transport that answers locally instead of calling Telegram"""
+
+    def __init__(self):
+        self.calls: Dict[str, int] = {}
+        self._message_id = 0
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_request(self, url: str, method: str, request_data: Optional[RequestData] = None,
+                         read_timeout=None, write_timeout=None, connect_timeout=None, pool_timeout=None) -> Tuple[int, bytes]:
+        api_method = url.rsplit("/", 1)[-1]
+        self.calls[api_method] = self.calls.get(api_method, 0) + 1
+        params = request_data.parameters if request_data else {}
+        if api_method == "getMe":
+            result: Any = {"id": 1, "is_bot": True, "first_name": "PumpShield", "username": "pumpshield_bench_bot"}
+        elif api_method in ("sendMessage", "editMessageText"):
+            self._message_id += 1
+            result = {"message_id": params.get("message_id", self._message_id), "date": int(time.time()),
+                      "chat": {"id": params.get("chat_id", 0), "type": "private"}, "text": params.get("text", "")}
+        else:
+            result = True
+        return 200, json.dumps({"ok": True, "result": result}).encode()
+
+def configure_bot() -> None:
+    """Point the bot at the stand-ins and lift limits that would only measure themselves"""
+    bot.PUMP_API_URL = BASE_URL
+    bot.rpc_health = bot.RpcHealthTracker([BASE_URL + "/"], 10, 3, 0.3)
+    bot.ADMIN_USER_ID = None
+    bot.user_limiter = bot.UserRateLimiter(1e9, 1, 100_000)
+    # Local stand-ins have no quotas to respect
+    bot.RPC_RATE_LIMIT = bot.RPC_RATE_BURST = float("inf")
+    bot.PUMP_API_RATE_LIMIT = bot.PUMP_API_RATE_BURST = float("inf")
+    # The stub Bot API has no flood control; keep the debounce, drop the pacing
+    bot.message_updater = bot.MessageUpdater(bot.EDIT_DEBOUNCE, float("inf"), float("inf"), float("inf"),
+                                             bot.TELEGRAM_MAX_RETRIES)
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)] if ordered else 0.0
+
+# 1️⃣ Scoring micro-benchmark
+def bench_scoring(coins: list, rounds: int = 20) -> Dict[str, Any]:
+    print(f"1️⃣ Scoring {len(coins)} mints ({rounds} rounds):")
+    started = time.perf_counter()
+    for _ in range(rounds):
+        bot.score_risk_batch(coins)
+    batch = (time.perf_counter() - started) / rounds
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for coin in coins:
+            bot.score_risk_batch([coin])
+    single = (time.perf_counter() - started) / rounds
+
+    print(f"   Batch:      {batch * 1000:8.2f} ms  ({len(coins) / batch:,.0f} mints/s)")
+    print(f"   One by one: {single * 1000:8.2f} ms  ({len(coins) / single:,.0f} mints/s)")
+    print()
+    return {"mints": len(coins), "batch_ms": batch * 1000, "single_ms": single * 1000,
+            "batch_mints_per_s": len(coins) / batch, "single_mints_per_s": len(coins) / single}
+
+# 2️⃣ Multi-mint rug check
+async def bench_rugcheck_many(coins: list) -> Dict[str, Any]:
+    print(f"2️⃣ Multi-mint rug check, {len(coins)} mints (concurrency {bot.RUGCHECK_CONCURRENCY}):")
+    mints = [coin["mint"] for coin in coins]
+    # Start cold: no rug results, pump.fun documents or holder scans from earlier phases
+    bot.rug_cache = bot.TTLCache(max_size=bot.RUG_CACHE_MAX_SIZE, ttl=bot.RUG_CACHE_TTL)
+    bot.holder_stats = bot.TTLCache(max_size=bot.RUG_CACHE_MAX_SIZE, ttl=bot.HOLDER_SCAN_TTL * 2)
+    bot.coin_cache.clear()
+    started = time.perf_counter()
+    results = await bot.check_rug_risk_many(mints)
+    cold = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await bot.check_rug_risk_many(mints)
+    warm = time.perf_counter() - started
+
+    high = sum(1 for result in results if result.get("risk"))
+    print(f"   Cold: {cold:6.2f} s  ({len(mints) / cold:,.0f} mints/s)")
+    print(f"   Warm: {warm * 1000:6.2f} ms")
+    print(f"   {high}/{len(results)} flagged high risk")
+    print()
+    return {"mints": len(mints), "cold_s": cold, "warm_ms": warm * 1000,
+            "cold_mints_per_s": len(mints) / cold, "high_risk": high}
+
+# 3️⃣ Synthetic Telegram load through the real handlers
+def make_update(app, update_id: int, user_id: int, text: str) -> Update:
+    command = text.split()[0]
+    return Update.de_json({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id, "date": int(time.time()), "text": text,
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"},
+            "entities": [{"type": "bot_command", "offset": 0, "length": len(command)}],
+        },
+    }, app.bot)
+
+async def bench_commands(coins: list, updates: int, users: int, rate: float) -> Dict[str, Any]:
+    print(f"3️⃣ Handler load: {updates} updates per command from {users} users"
+          f"{f' at {rate:g}/s' if rate else ' (burst)'}:")
+    stub = StubBotRequest()
+    app = bot.build_application(token="123456:BENCHMARK", request=stub)
+    enqueued: Dict[int, float] = {}
+    latencies: Dict[int, float] = {}
+    done = asyncio.Event()
+    expected = 0
+
+    async def mark_done(update: Update, context) -> None:
+        latencies[update.update_id] = time.perf_counter() - enqueued[update.update_id]
+        if len(latencies) >= expected:
+            done.set()
+
+    # Runs after the command handler (group 0) has finished with the update
+    app.add_handler(TypeHandler(Update, mark_done), group=1)
+    mints = [coin["mint"] for coin in coins]
+    results = {}
+    update_id = 0
+    await app.initialize()
+    await app.start()
+    try:
+        for command in COMMANDS:
+            latencies.clear()
+            done.clear()
+            expected = updates
+            first_id = update_id
+            started = time.perf_counter()
+            for i in range(updates):
+                update_id += 1
+                text = f"/{command} {mints[(first_id + i) % len(mints)]}"
+                update = make_update(app, update_id, 1000 + i % users, text)
+                enqueued[update_id] = time.perf_counter()
+                await app.update_queue.put(update)
+                if rate:
+                    await asyncio.sleep(1 / rate)
+            await done.wait()
+            wall = time.perf_counter() - started
+            samples = [latencies[i] * 1000 for i in range(first_id + 1, update_id + 1)]
+            results[command] = {
+                "updates": updates,
+                "p50_ms": percentile(samples, 0.50),
+                "p95_ms": percentile(samples, 0.95),
+                "p99_ms": percentile(samples, 0.99),
+                "max_ms": max(samples),
+                "throughput_per_s": updates / wall,
+            }
+            r = results[command]
+            print(f"   /{command:<9} p50 {r['p50_ms']:7.1f} ms  p95 {r['p95_ms']:7.1f} ms  "
+                  f"p99 {r['p99_ms']:7.1f} ms  {r['throughput_per_s']:7.1f} upd/s")
+    finally:
+        await app.stop()
+        await app.shutdown()
+    print(f"   Bot API calls: {dict(sorted(stub.calls.items()))}")
+    print()
+    return results
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except Exception:
+        return None
+
+def compare(report: Dict[str, Any], baseline_path: str) -> None:
+    """Print per-command p95 and throughput changes against a previous results file"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"📈 Compared with {baseline_path} ({baseline.get('revision') or 'unknown revision'}):")
+    for command, current in report["commands"].items():
+        previous = baseline.get("commands", {}).get(command)
+        if not previous:
+            continue
+        p95 = (current["p95_ms"] / previous["p95_ms"] - 1) * 100 if previous["p95_ms"] else 0.0
+        rate = (current["throughput_per_s"] / previous["throughput_per_s"] - 1) * 100 if previous["throughput_per_s"] else 0.0
+        flag = "⚠️" if p95 > 10 or rate < -10 else "✅"
+        print(f"   {flag} /{command:<9} p95 {p95:+6.1f}%  throughput {rate:+6.1f}%")
+    print()
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="mainnet", help="upstream behaviour preset")
+    parser.add_argument("--latency-ms", type=float, help="override the profile's base latency")
+    parser.add_argument("--jitter-ms", type=float, help="override the profile's latency jitter")
+    parser.add_argument("--error-rate", type=float, help="override the profile's share of HTTP 500s")
+    parser.add_argument("--timeout-rate", type=float, help="override the profile's share of hanging requests")
+    parser.add_argument("--hang-s", type=float, default=3.0, help="how long a hanging request stalls")
+    parser.add_argument("--updates", type=int, default=200, help="updates per command")
+    parser.add_argument("--users", type=int, default=50, help="distinct users/chats sending them")
+    parser.add_argument("--rate", type=float, default=0, help="updates per second (0 = all at once)")
+    parser.add_argument("--mints", type=int, default=1000, help="fixture mints for the batch benchmarks")
+    parser.add_argument("--output", default="benchmark_results.json", help="machine-readable results file")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--record", nargs="+", metavar="MINT", help="re-record fixtures for these mints")
+    args = parser.parse_args()
+    if args.record:
+        await record_fixtures(args.record)
+        return
+
+    for name in ("httpx", "apscheduler", "telegram.ext"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    logging.getLogger("main_user_friendly").setLevel(logging.ERROR)
+    profile = dict(PROFILES[args.profile])
+    for key in ("latency_ms", "jitter_ms", "error_rate", "timeout_rate"):
+        if getattr(args, key) is not None:
+            profile[key] = getattr(args, key)
+
+    coins = load_fixtures()[:args.mints]
+    print(f"🏁 PumpShield Benchmark — profile {args.profile} {profile}\n")
+    stand_ins = StandIns(coins, profile, args.hang_s)
+    await stand_ins.start()
+    configure_bot()
+    try:
+        scoring = bench_scoring(coins)
+        rugcheck_many = await bench_rugcheck_many(coins)
+        commands = await bench_commands(coins, args.updates, args.users, args.rate)
+    finally:
+        await bot.background.cancel_all()
+        await bot.rpc_pool.close()
+        await bot.http_pool.close()
+        await stand_ins.stop()
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "revision": git_revision(),
+        "profile": {"name": args.profile, **profile, "hang_s": args.hang_s},
+        "load": {"updates": args.updates, "users": args.users, "rate": args.rate},
+        "scoring": scoring,
+        "rugcheck_many": rugcheck_many,
+        "commands": commands,
+        "upstream_requests": dict(sorted(stand_ins.requests.items())),
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"📄 Results written to {args.output}\n")
+    if args.baseline:
+        compare(report, args.baseline)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -22,6 +22,8 @@ from pydantic import BaseModel, validator
 from asyncio_throttle import Throttler
 import time
 
+from ttl_cache import TTLCache
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -34,6 +36,11 @@ MAX_SOL_PER_TRADE = float(os.getenv("MAX_SOL_PER_TRADE", "1.0"))
 RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "10"))
 RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
 
+# 🗄️ Rug check cache settings
+RUG_CACHE_TTL = float(os.getenv("RUG_CACHE_TTL", "30"))
+RUG_CACHE_NEGATIVE_TTL = float(os.getenv("RUG_CACHE_NEGATIVE_TTL", "5"))
+RUG_CACHE_MAX_SIZE = int(os.getenv("RUG_CACHE_MAX_SIZE", "1024"))
+
 WALLET_FILE = "wallets.json"
 
 # 🌐 Better RPC nodes with fallbacks
@@ -308,8 +315,27 @@ async def get_token_balance(ca: str, wallet_addr: str) -> tuple[int, float]:
         logger.error(f"Balance check error: {e}")
         return 0, 0.0
 
+# 🗄️ Rug check result cache
+rug_cache = TTLCache(max_size=RUG_CACHE_MAX_SIZE, ttl=RUG_CACHE_TTL)
+
 # 🚨 Enhanced rug detection
 async def check_rug_risk(ca: str) -> Dict[str, Any]:
+    """Rug check shared by all commands, served from cache when fresh.
+
+    Successful lookups are kept for RUG_CACHE_TTL seconds; failed lookups
+    only for RUG_CACHE_NEGATIVE_TTL so an outage is retried soon without
+    every command hitting the API in the meantime.
+    """
+    cached = rug_cache.get(ca)
+    if cached is not None:
+        return cached
+
+    result = await fetch_rug_risk(ca)
+    ttl = RUG_CACHE_TTL if "data" in result else RUG_CACHE_NEGATIVE_TTL
+    rug_cache.set(ca, result, ttl=ttl)
+    return result
+
+async def fetch_rug_risk(ca: str) -> Dict[str, Any]:
     """Enhanced rug pull detection with more metrics"""
     try:
         async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
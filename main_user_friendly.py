@@ -5,23 +5,43 @@ import json
 import base64
 import struct
 import logging
-from typing import Optional, Dict, Any, List
+import functools
+import hmac
+import queue
+import re
+import secrets
+import signal
+import sqlite3
+import threading
+from array import array
+from bisect import bisect_left
+from contextlib import asynccontextmanager, contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from collections import OrderedDict, deque
+from typing import Optional, Dict, Any, List, Callable, Awaitable, NamedTuple
 from datetime import datetime, timedelta
+from urllib.parse import urlsplit
 import requests
 import aiohttp
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CommandHandler, ContextTypes, CallbackQueryHandler
+from aiohttp import web
+import numpy as np
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, Message
+from telegram.error import BadRequest, RetryAfter
+from telegram.ext import Application, BaseUpdateProcessor, CommandHandler, ContextTypes, CallbackQueryHandler
+from telegram.request import BaseRequest, HTTPXRequest
 from dotenv import load_dotenv
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from solders.transaction import VersionedTransaction
 from solders.message import MessageV0
-from solana.rpc.api import Client
-from solana.rpc.types import MemcmpOpts
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Commitment
+from solana.rpc.types import DataSliceOpts, TokenAccountOpts
 from pydantic import BaseModel, validator
-from asyncio_throttle import Throttler
 import time
 
+from ttl_cache import TTLCache
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -33,8 +53,144 @@ ADMIN_USER_ID = os.getenv("ADMIN_USER_ID")
 MAX_SOL_PER_TRADE = float(os.getenv("MAX_SOL_PER_TRADE", "1.0"))
 RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "10"))
 RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
+RATE_LIMIT_MAX_USERS = int(os.getenv("RATE_LIMIT_MAX_USERS", "10000"))
+# Token cost per command; a user holds up to RATE_LIMIT_REQUESTS tokens, refilled over RATE_LIMIT_WINDOW
+RATE_LIMIT_COSTS = {
+    command: float(cost)
+    for command, cost in (item.split("=") for item in os.getenv(
+        "RATE_LIMIT_COSTS", "balance=1,rugcheck=2,auto=2,pump=3,dump=3"
+    ).split(","))
+}
 
-WALLET_FILE = "wallets.json"
+# 🚰 Upstream quotas (requests per second, burst size)
+RPC_RATE_LIMIT = float(os.getenv("RPC_RATE_LIMIT", "10"))
+RPC_RATE_BURST = float(os.getenv("RPC_RATE_BURST", "20"))
+PUMP_API_RATE_LIMIT = float(os.getenv("PUMP_API_RATE_LIMIT", "5"))
+PUMP_API_RATE_BURST = float(os.getenv("PUMP_API_RATE_BURST", "10"))
+# Per-node overrides as host=rate:burst; other nodes use RPC_RATE_LIMIT / RPC_RATE_BURST
+RPC_NODE_LIMITS = {
+    host.strip(): tuple(float(value) for value in limit.split(":"))
+    for host, limit in (item.split("=") for item in os.getenv("RPC_NODE_LIMITS", "").split(",") if item.strip())
+}
+
+# ✏️ Telegram send pacing: progress edits are merged, sends stay within flood limits
+EDIT_DEBOUNCE = float(os.getenv("EDIT_DEBOUNCE", "0.7"))  # seconds a progress edit may be held back
+TELEGRAM_CHAT_RATE = float(os.getenv("TELEGRAM_CHAT_RATE", "1"))  # sends/edits per second per chat
+TELEGRAM_CHAT_BURST = float(os.getenv("TELEGRAM_CHAT_BURST", "3"))
+TELEGRAM_GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", "30"))  # per second across all chats
+TELEGRAM_MAX_RETRIES = int(os.getenv("TELEGRAM_MAX_RETRIES", "3"))  # RetryAfter waits before giving up
+
+# 🌍 Update delivery: "polling" (default) or "webhook" via the embedded web server
+BOT_MODE = os.getenv("BOT_MODE", "polling").lower()
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")  # public https base URL, e.g. https://pumpshield.onrender.com
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/telegram")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")  # generated at startup when empty
+WEB_HOST = os.getenv("WEB_HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8080"))
+HEALTH_ENDPOINT = os.getenv("HEALTH_ENDPOINT", "false").lower() == "true"  # /healthz in polling mode too
+
+# 📈 Instrumentation
+METRICS_ENDPOINT = os.getenv("METRICS_ENDPOINT", "false").lower() == "true"  # Prometheus text at /metrics
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))  # seconds between event-loop lag samples
+
+# 🗄️ Rug check cache settings
+RUG_CACHE_TTL = float(os.getenv("RUG_CACHE_TTL", "30"))
+RUG_CACHE_NEGATIVE_TTL = float(os.getenv("RUG_CACHE_NEGATIVE_TTL", "5"))
+RUG_CACHE_MAX_SIZE = int(os.getenv("RUG_CACHE_MAX_SIZE", "1024"))
+
+# 🔌 HTTP connection pool settings
+HTTP_LIMIT_PER_HOST = int(os.getenv("HTTP_LIMIT_PER_HOST", "20"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "60"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+
+# 🩺 RPC health tracking settings
+RPC_HEALTH_INTERVAL = float(os.getenv("RPC_HEALTH_INTERVAL", "10"))
+RPC_HEALTH_TIMEOUT = float(os.getenv("RPC_HEALTH_TIMEOUT", "3"))
+RPC_EWMA_ALPHA = float(os.getenv("RPC_EWMA_ALPHA", "0.3"))
+RPC_SLOT_LAG_PENALTY_MS = float(os.getenv("RPC_SLOT_LAG_PENALTY_MS", "20"))
+RPC_MAX_SLOT_LAG = int(os.getenv("RPC_MAX_SLOT_LAG", "150"))
+
+# 📡 Async RPC client settings
+RPC_COMMITMENT = os.getenv("RPC_COMMITMENT", "confirmed")
+RPC_TIMEOUT = float(os.getenv("RPC_TIMEOUT", "8"))
+RPC_MAX_ACCOUNTS_PER_CALL = 100  # getMultipleAccounts limit
+RPC_COMPACT_READS = os.getenv("RPC_COMPACT_READS", "true").lower() == "true"
+
+# ⏱️ Hedged RPC reads
+RPC_HEDGE_READS = os.getenv("RPC_HEDGE_READS", "true").lower() == "true"
+RPC_HEDGE_BUDGET_PER_MIN = int(os.getenv("RPC_HEDGE_BUDGET_PER_MIN", "60"))
+RPC_HEDGE_MIN_DELAY_MS = float(os.getenv("RPC_HEDGE_MIN_DELAY_MS", "50"))
+RPC_HEDGE_MAX_DELAY_MS = float(os.getenv("RPC_HEDGE_MAX_DELAY_MS", "1000"))
+RPC_LATENCY_SAMPLES = int(os.getenv("RPC_LATENCY_SAMPLES", "200"))
+RPC_HEDGE_MIN_SAMPLES = int(os.getenv("RPC_HEDGE_MIN_SAMPLES", "20"))
+ATA_CACHE_SIZE = int(os.getenv("ATA_CACHE_SIZE", "4096"))
+
+# ⚡ Circuit breaker settings
+BREAKER_WINDOW = int(os.getenv("BREAKER_WINDOW", "20"))
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", "5"))
+BREAKER_FAILURE_RATE = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "30"))
+
+# 💼 Portfolio overview settings
+PORTFOLIO_CONCURRENCY = int(os.getenv("PORTFOLIO_CONCURRENCY", "8"))
+PORTFOLIO_MAX_LINES = int(os.getenv("PORTFOLIO_MAX_LINES", "30"))
+
+# 🧮 Risk scoring weights and thresholds
+RISK_WEIGHT_LP_UNLOCKED = float(os.getenv("RISK_WEIGHT_LP_UNLOCKED", "1"))
+RISK_WEIGHT_OWNER_ADMIN = float(os.getenv("RISK_WEIGHT_OWNER_ADMIN", "1"))
+RISK_WEIGHT_LOW_VOLUME = float(os.getenv("RISK_WEIGHT_LOW_VOLUME", "1"))
+RISK_WEIGHT_FEW_HOLDERS = float(os.getenv("RISK_WEIGHT_FEW_HOLDERS", "1"))
+RISK_WEIGHT_LOW_MARKET_CAP = float(os.getenv("RISK_WEIGHT_LOW_MARKET_CAP", "1"))
+RISK_WEIGHT_CONCENTRATED = float(os.getenv("RISK_WEIGHT_CONCENTRATED", "1"))
+RISK_MIN_VOLUME = float(os.getenv("RISK_MIN_VOLUME", "1000"))
+RISK_MIN_HOLDERS = float(os.getenv("RISK_MIN_HOLDERS", "50"))
+RISK_MIN_MARKET_CAP = float(os.getenv("RISK_MIN_MARKET_CAP", "10000"))
+RISK_LOW_MAX = float(os.getenv("RISK_LOW_MAX", "1"))
+RISK_MEDIUM_MAX = float(os.getenv("RISK_MEDIUM_MAX", "3"))
+RISK_HIGH_SCORE = float(os.getenv("RISK_HIGH_SCORE", "3"))
+RUGCHECK_MAX_MINTS = int(os.getenv("RUGCHECK_MAX_MINTS", "20"))
+RUGCHECK_CONCURRENCY = int(os.getenv("RUGCHECK_CONCURRENCY", "8"))
+
+# 👥 On-chain holder concentration settings
+HOLDER_TOP10_MAX_SHARE = float(os.getenv("HOLDER_TOP10_MAX_SHARE", "0.5"))
+HOLDER_TOP10_TTL = float(os.getenv("HOLDER_TOP10_TTL", "60"))
+HOLDER_SCAN_TTL = float(os.getenv("HOLDER_SCAN_TTL", "900"))
+HOLDER_SCAN_MAX_ACCOUNTS = int(os.getenv("HOLDER_SCAN_MAX_ACCOUNTS", "50000"))
+HOLDER_SCAN_MAX_BYTES = int(os.getenv("HOLDER_SCAN_MAX_BYTES", str(16 * 1024 * 1024)))
+HOLDER_SCAN_TIMEOUT = float(os.getenv("HOLDER_SCAN_TIMEOUT", "30"))
+HOLDER_SCAN_CONCURRENCY = int(os.getenv("HOLDER_SCAN_CONCURRENCY", "2"))
+HOLDER_TOP10_CONCURRENCY = int(os.getenv("HOLDER_TOP10_CONCURRENCY", "8"))
+
+PUMP_API_URL = os.getenv("PUMP_API_URL", "https://api.pump.fun")
+JITO_BUNDLE_URL = "https://mainnet.block-engine.jito.wtf/api/v1/bundles"
+
+WALLET_FILE = "wallets.json"  # legacy store, imported into WALLET_DB once
+WALLET_DB = os.getenv("WALLET_DB", "wallets.db")
+
+# 📈 On-chain bonding-curve cache (seconds); entries also lapse once a newer slot is seen
+BONDING_CURVE_TTL = float(os.getenv("BONDING_CURVE_TTL", "2"))
+
+# 🗄️ Disk-backed pump.fun metadata cache (seconds), kept apart from the wallet database
+COIN_CACHE_DB = os.getenv("COIN_CACHE_DB", "coin_cache.db")
+COIN_CACHE_FRESH = float(os.getenv("COIN_CACHE_FRESH", "30"))
+COIN_CACHE_MAX_AGE = float(os.getenv("COIN_CACHE_MAX_AGE", "600"))
+COIN_CACHE_MAX_ENTRIES = int(os.getenv("COIN_CACHE_MAX_ENTRIES", "5000"))
+
+# 👁️ /auto watchlist settings
+WATCH_TICK_SECONDS = float(os.getenv("WATCH_TICK_SECONDS", "10"))
+WATCH_INTERVAL_MIN = float(os.getenv("WATCH_INTERVAL_MIN", "30"))
+WATCH_INTERVAL_MAX = float(os.getenv("WATCH_INTERVAL_MAX", "300"))
+WATCH_CONCURRENCY = int(os.getenv("WATCH_CONCURRENCY", "8"))
+
+# 🚦 Concurrent update processing (per-chat order is kept, UPDATE_MAX_PENDING is per chat)
+UPDATE_CONCURRENCY = int(os.getenv("UPDATE_CONCURRENCY", "16"))
+UPDATE_MAX_PENDING = int(os.getenv("UPDATE_MAX_PENDING", "20"))
+SLOW_HANDLER_SECONDS = float(os.getenv("SLOW_HANDLER_SECONDS", "5"))
+
+# 🔔 Optional websocket push monitoring (empty RPC_WS_URL disables it)
+RPC_WS_URL = os.getenv("RPC_WS_URL", "")
+WS_RESCORE_DEBOUNCE = float(os.getenv("WS_RESCORE_DEBOUNCE", "2"))
+WS_RECONNECT_MAX_DELAY = float(os.getenv("WS_RECONNECT_MAX_DELAY", "30"))
 
 # 🌐 Better RPC nodes with fallbacks
 RPC_NODES = [
@@ -52,9 +208,18 @@ TOKEN_PROGRAM_ID = Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5
 ASSOCIATED_TOKEN_PROGRAM_ID = Pubkey.from_string("ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL")
 SOL_MINT = Pubkey.from_string("So11111111111111111111111111111111111111112")
 
-# Rate limiting
-throttler = Throttler(rate_limit=RATE_LIMIT_REQUESTS, period=RATE_LIMIT_WINDOW)
-user_last_command = {}
+# 🧱 SPL Token account layouts
+TOKEN_ACCOUNT_SIZE = 165
+TOKEN_AMOUNT_OFFSET = 64
+MINT_ACCOUNT_SIZE = 82
+MINT_DECIMALS_OFFSET = 44
+TOKEN_ACCOUNT_STATES = {0: "uninitialized", 1: "initialized", 2: "frozen"}
+
+# 📈 pump.fun bonding-curve layout: 8-byte discriminator, five u64 reserves/supply, bool complete
+BONDING_CURVE_OFFSET = 8
+BONDING_CURVE_SIZE = 41
+PUMP_TOKEN_DECIMALS = 6
+PUMP_INITIAL_REAL_TOKEN_RESERVES = 793_100_000_000_000  # tokens sellable on a fresh curve (raw units)
 
 # 📚 Help text and examples
 HELP_TEXT = {
@@ -76,6 +241,7 @@ HELP_TEXT = {
 **3️⃣ Check Balance:**
 • `/balance <CA>`
 • Shows both token and SOL balance
+• `/balance` alone shows your whole portfolio
 
 **4️⃣ Check Risk:**
 • `/rugcheck <CA>`
@@ -143,13 +309,14 @@ HELP_TEXT = {
 📊 **BALANCE COMMAND - `/balance`**
 
 **📝 Syntax:**
-`/balance <CONTRACT_ADDRESS>`
+`/balance [CONTRACT_ADDRESS]`
 
 **📊 Parameters:**
-• **CONTRACT_ADDRESS**: Token contract to check
+• **CONTRACT_ADDRESS**: Token contract to check (leave out for the full portfolio)
 
-**✅ Example:**
+**✅ Examples:**
 • `/balance So11111111111111111111111111111111111111112`
+• `/balance` - every wallet and token at once
 
 **🔍 What you get:**
 • **Token Balance**: Exact number of tokens you own
@@ -168,25 +335,28 @@ HELP_TEXT = {
 🛡️ **RUG CHECK COMMAND - `/rugcheck`**
 
 **📝 Syntax:**
-`/rugcheck <CONTRACT_ADDRESS>`
+`/rugcheck <CONTRACT_ADDRESS> [MORE_ADDRESSES...]`
 
 **📊 Parameters:**
 • **CONTRACT_ADDRESS**: Token contract to analyze
+• **MORE_ADDRESSES**: Optional, compare several tokens in a ranked table
 
-**✅ Example:**
+**✅ Examples:**
 • `/rugcheck 7xKXtg2CW87d97TXJSDpbD5jBkheTqA83TZRuJosgAsU`
+• `/rugcheck <CA1> <CA2> <CA3>` - riskiest first
 
 **🔍 Risk Analysis:**
 • **LP Locked**: Is liquidity pool locked?
 • **Owner Rights**: Does owner have admin control?
 • **Volume**: Recent trading activity
 • **Holders**: Number of token holders
+• **Concentration**: Top 10 holders' share (on-chain)
 • **Market Cap**: Total market value
 
 **📈 Risk Score:**
 • **0-1**: ✅ Low Risk
 • **2-3**: ⚠️ Medium Risk  
-• **4-5**: 🚨 High Risk
+• **4-6**: 🚨 High Risk
 
 **💡 Smart Detection:**
 • Multiple risk factors analyzed
@@ -210,7 +380,11 @@ HELP_TEXT = {
 **🔍 What happens:**
 1. Analyzes token for rug pull risks
 2. If HIGH RISK detected → sells immediately
-3. If LOW RISK → continues monitoring
+3. If LOW RISK → keeps re-checking in the background
+   (more often as the risk score rises)
+
+**🛑 Stop monitoring:**
+• `/auto <CONTRACT_ADDRESS> stop`
 
 **⚠️ Auto-sell triggers:**
 • LP not locked + Owner has admin rights
@@ -232,6 +406,9 @@ class ValidationError(Exception):
 class TransactionError(Exception):
     pass
 
+class CircuitOpenError(Exception):
+    pass
+
 # 🛡️ Enhanced input validation with detailed feedback
 def validate_ca_address(ca: str) -> tuple[bool, str]:
     """Validate Solana contract address with detailed feedback"""
@@ -274,20 +451,273 @@ def format_number(num: float, decimals: int = 6) -> str:
     else:
         return f"{num:,.{decimals}f}"
 
+def format_price(num: float) -> str:
+    """Per-token prices are tiny; show them without scientific notation"""
+    return f"{num:.12f}".rstrip("0").rstrip(".") or "0"
+
+def format_age(seconds: float) -> str:
+    """Compact age like 12s, 4m or 2h"""
+    if seconds < 60:
+        return f"{max(seconds, 0):.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds / 3600:.1f}h"
+
 def shorten_address(address: str, start: int = 8, end: int = 8) -> str:
     """Shorten long addresses for display"""
     if len(address) <= start + end + 3:
         return address
     return f"{address[:start]}...{address[-end:]}"
 
-def check_rate_limit(user_id: int) -> bool:
-    """Check if user is rate limited"""
-    now = time.time()
-    if user_id in user_last_command:
-        if now - user_last_command[user_id] < 5:  # 5 second cooldown
-            return False
-    user_last_command[user_id] = now
-    return True
+# 📈 Latency histograms and counters
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in seconds (Prometheus `le` buckets plus +Inf)"""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate by interpolating inside the bucket that holds the q-th observation"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+class Metrics:
+    """Process-wide histograms and counters, keyed by metric name and labels"""
+
+    def __init__(self):
+        self.histograms: Dict[tuple, LatencyHistogram] = {}
+        self.counters: Dict[tuple, float] = {}
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, str]) -> tuple:
+        return name, tuple(sorted(labels.items()))
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        key = self._key(name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        key = self._key(name, labels)
+        self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def counter(self, name: str, **labels: str) -> float:
+        return self.counters.get(self._key(name, labels), 0.0)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str):
+        """Time the block into `name`, tagged with outcome ok/error/cancelled.
+
+        The block may set sample["outcome"] itself, e.g. for an HTTP error
+        status that does not raise.
+        """
+        sample = {"outcome": None}
+        started = time.monotonic()
+        try:
+            yield sample
+        except asyncio.CancelledError:
+            sample["outcome"] = sample["outcome"] or "cancelled"
+            raise
+        except Exception:
+            sample["outcome"] = sample["outcome"] or "error"
+            raise
+        finally:
+            self.observe(name, time.monotonic() - started, outcome=sample["outcome"] or "ok", **labels)
+
+    def summary(self, name: str, by: str) -> Dict[str, Dict[str, Any]]:
+        """Histograms of `name` merged per value of label `by`, with call and error counts"""
+        merged: Dict[str, LatencyHistogram] = {}
+        errors: Dict[str, int] = {}
+        for (metric, labels), histogram in self.histograms.items():
+            if metric != name:
+                continue
+            labels = dict(labels)
+            group = labels.get(by, "")
+            merged.setdefault(group, LatencyHistogram()).merge(histogram)
+            if labels.get("outcome", "ok") not in ("ok", "cancelled"):
+                errors[group] = errors.get(group, 0) + histogram.count
+        return {
+            group: {"count": h.count, "errors": errors.get(group, 0),
+                    "p50": h.quantile(0.5), "p95": h.quantile(0.95), "max": h.max}
+            for group, h in sorted(merged.items())
+        }
+
+    def render_prometheus(self, gauges: List[tuple[str, Dict[str, str], float]]) -> str:
+        """Prometheus text exposition of every histogram and counter plus the given gauges"""
+        lines = []
+
+        def series(name: str, labels: Dict[str, str], value: float) -> None:
+            escaped = {k: str(v).replace("\\", "\\\\").replace('"', '\\"') for k, v in labels.items()}
+            label_text = ",".join(f'{k}="{v}"' for k, v in escaped.items())
+            lines.append(f"pumpshield_{name}{{{label_text}}} {value:g}" if label_text else f"pumpshield_{name} {value:g}")
+
+        typed = set()
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            if name not in typed:
+                lines.append(f"# TYPE pumpshield_{name}_seconds histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, n in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                cumulative += n
+                series(f"{name}_seconds_bucket", {**dict(labels), "le": "+Inf" if bound == float("inf") else f"{bound:g}"}, cumulative)
+            series(f"{name}_seconds_sum", dict(labels), histogram.sum)
+            series(f"{name}_seconds_count", dict(labels), histogram.count)
+        for (name, labels), value in sorted(self.counters.items()):
+            if name not in typed:
+                lines.append(f"# TYPE pumpshield_{name}_total counter")
+                typed.add(name)
+            series(f"{name}_total", dict(labels), value)
+        for name, labels, value in gauges:
+            if name not in typed:
+                lines.append(f"# TYPE pumpshield_{name} gauge")
+                typed.add(name)
+            series(name, labels, value)
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+
+def upstream_label(url: str) -> str:
+    """Metric label for an upstream URL: its host"""
+    return urlsplit(url).netloc or url
+
+def timed_handler(name: str, callback: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Wrap a handler so every call lands in the per-handler latency histogram"""
+    @functools.wraps(callback)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        with metrics.timer("handler", handler=name):
+            return await callback(update, context)
+    return wrapper
+
+class InstrumentedRequest(HTTPXRequest):
+    """Bot API transport that times every Telegram call by API method and status"""
+
+    async def do_request(self, url: str, method: str, *args, **kwargs) -> tuple[int, bytes]:
+        with metrics.timer("telegram", method=url.rsplit("/", 1)[-1]) as sample:
+            code, payload = await super().do_request(url, method, *args, **kwargs)
+            if code == 429:
+                sample["outcome"] = "rate_limited"
+            elif code != 200:
+                sample["outcome"] = "error"
+            return code, payload
+
+class LoopLagMonitor:
+    """Samples event-loop lag: how much later than asked a short sleep wakes up"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.last = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.last = max(time.monotonic() - started - self.interval, 0.0)
+            metrics.observe("loop_lag", self.last)
+
+loop_lag = LoopLagMonitor(LOOP_LAG_INTERVAL)
+
+def setup_queue_logging() -> Optional[QueueListener]:
+    """Route the root handlers through a queue so log I/O happens on a listener thread"""
+    root = logging.getLogger()
+    handlers = [h for h in root.handlers if not isinstance(h, QueueHandler)]
+    if not handlers or len(handlers) != len(root.handlers):
+        return None
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+# 🚦 Rate limiting
+class UserRateLimiter:
+    """Per-user token buckets in a bounded LRU map.
+
+    A bucket that has been idle long enough to refill completely is
+    indistinguishable from a new one, so it is evicted; beyond max_users
+    the least recently seen user is dropped as well.
+    """
+
+    def __init__(self, capacity: float, window: float, max_users: int):
+        self.capacity = capacity
+        self.rate = capacity / window
+        self.max_users = max_users
+        self._buckets: OrderedDict = OrderedDict()  # user_id -> (tokens, updated_at)
+
+    def allow(self, user_id: int, cost: float = 1.0) -> bool:
+        now = time.monotonic()
+        self._evict(now)
+        tokens, updated = self._buckets.pop(user_id, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[user_id] = (tokens, now)
+        return allowed
+
+    def _evict(self, now: float) -> None:
+        refill_time = self.capacity / self.rate
+        while self._buckets:
+            user_id, (tokens, updated) = next(iter(self._buckets.items()))
+            if len(self._buckets) < self.max_users and now - updated < refill_time:
+                break
+            del self._buckets[user_id]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+user_limiter = UserRateLimiter(RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW, RATE_LIMIT_MAX_USERS)
+
+def check_rate_limit(user_id: int, command: str = "") -> bool:
+    """Charge the command's cost to the user's bucket; False if it is empty"""
+    allowed = user_limiter.allow(user_id, RATE_LIMIT_COSTS.get(command, 1.0))
+    if not allowed:
+        metrics.inc("rate_limited", command=command or "other")
+    return allowed
 
 def check_admin_access(user_id: int) -> bool:
     """Check if user has admin access (if admin is set)"""
@@ -296,52 +726,323 @@ def check_admin_access(user_id: int) -> bool:
     return True  # If no admin set, allow all users
 
 # 🧠 Enhanced helper functions
+class WalletStore:
+    """SQLite-backed wallet store with an in-memory mint → wallet index.
+
+    Reads are served from memory; each new wallet is committed in its own
+    transaction (WAL journal), so a crash never leaves a half-written file.
+    """
+
+    def __init__(self, path: str, legacy_json: str):
+        self.path = path
+        self.legacy_json = legacy_json
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._wallets: Dict[str, Dict[str, Any]] = {}
+        self._by_mint: Dict[str, Dict[str, Any]] = {}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS wallets ("
+                "address TEXT PRIMARY KEY, private_key TEXT NOT NULL, created_at TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS wallet_tokens ("
+                "mint TEXT PRIMARY KEY, address TEXT NOT NULL REFERENCES wallets(address))"
+            )
+            self._conn = conn
+            try:
+                self._migrate_json()
+                self._load()
+            except Exception:
+                # Never run on a half-opened store; the next call retries
+                self._conn = None
+                conn.close()
+                raise
+        return self._conn
+
+    def _migrate_json(self) -> None:
+        """Import of the legacy wallets.json, renamed to .migrated once committed.
+
+        Rows go in with INSERT OR IGNORE in one transaction, so an import
+        that failed (rolled back) or was interrupted before the rename is
+        simply repeated on the next start without losing or duplicating keys.
+        """
+        if not os.path.exists(self.legacy_json):
+            return
+        with open(self.legacy_json, "r") as f:
+            wallets = json.load(f)
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            for w in wallets:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO wallets (address, private_key, created_at) VALUES (?, ?, ?)",
+                    (w["address"], w["private_key"], w.get("created_at")),
+                )
+                for ca in w.get("used_for", []):
+                    # First wallet listing a mint wins, like the old linear scan
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO wallet_tokens (mint, address) VALUES (?, ?)",
+                        (ca, w["address"]),
+                    )
+        os.replace(self.legacy_json, self.legacy_json + ".migrated")
+        logger.info(f"Migrated {len(wallets)} wallets from {self.legacy_json} to {self.path}")
+
+    def _load(self) -> None:
+        self._wallets.clear()
+        self._by_mint.clear()
+        for address, private_key, created_at in self._conn.execute(
+            "SELECT address, private_key, created_at FROM wallets ORDER BY rowid"
+        ):
+            self._wallets[address] = {
+                "address": address,
+                "private_key": private_key,
+                "used_for": [],
+                "created_at": created_at,
+            }
+        for mint, address in self._conn.execute("SELECT mint, address FROM wallet_tokens ORDER BY rowid"):
+            wallet = self._wallets.get(address)
+            if wallet:
+                wallet["used_for"].append(mint)
+                self._by_mint[mint] = wallet
+
+    def all(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._db()
+            return [dict(w, used_for=list(w["used_for"])) for w in self._wallets.values()]
+
+    def get_for_token(self, ca: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._db()
+            wallet = self._by_mint.get(ca)
+            return dict(wallet, used_for=list(wallet["used_for"])) if wallet else None
+
+    def get_or_create(self, ca: str) -> Dict[str, Any]:
+        """Wallet used for a mint, creating and persisting a fresh one if needed"""
+        with self._lock:
+            conn = self._db()
+            wallet = self._by_mint.get(ca)
+            if wallet is None:
+                kp = Keypair()
+                wallet = {
+                    "address": str(kp.pubkey()),
+                    "private_key": str(kp),  # base58 secret key
+                    "used_for": [ca],
+                    "created_at": datetime.now().isoformat()
+                }
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.execute(
+                        "INSERT INTO wallets (address, private_key, created_at) VALUES (?, ?, ?)",
+                        (wallet["address"], wallet["private_key"], wallet["created_at"]),
+                    )
+                    conn.execute("INSERT INTO wallet_tokens (mint, address) VALUES (?, ?)", (ca, wallet["address"]))
+                self._wallets[wallet["address"]] = wallet
+                self._by_mint[ca] = wallet
+            return dict(wallet, used_for=list(wallet["used_for"]))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+wallet_store = WalletStore(WALLET_DB, WALLET_FILE)
+
+class WatchlistStore:
+    """Persistent /auto watchlist: which chats watch which mints, and when to re-check"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._entries: Dict[tuple, Dict[str, Any]] = {}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS watchlist ("
+                "chat_id INTEGER NOT NULL, mint TEXT NOT NULL, added_at TEXT, "
+                "risk_score REAL, next_check REAL NOT NULL, PRIMARY KEY (chat_id, mint))"
+            )
+            for chat_id, mint, added_at, risk_score, next_check in conn.execute(
+                "SELECT chat_id, mint, added_at, risk_score, next_check FROM watchlist"
+            ):
+                self._entries[(chat_id, mint)] = {
+                    "chat_id": chat_id, "mint": mint, "added_at": added_at,
+                    "risk_score": risk_score, "next_check": next_check,
+                }
+            self._conn = conn
+        return self._conn
+
+    def add(self, chat_id: int, mint: str, risk_score: float, next_check: float) -> None:
+        with self._lock:
+            entry = {
+                "chat_id": chat_id, "mint": mint, "added_at": datetime.now().isoformat(),
+                "risk_score": risk_score, "next_check": next_check,
+            }
+            self._db().execute(
+                "INSERT INTO watchlist (chat_id, mint, added_at, risk_score, next_check) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (chat_id, mint) DO UPDATE SET risk_score = excluded.risk_score, "
+                "next_check = excluded.next_check",
+                (chat_id, mint, entry["added_at"], risk_score, next_check),
+            )
+            self._entries.setdefault((chat_id, mint), entry).update(risk_score=risk_score, next_check=next_check)
+
+    def update(self, chat_id: int, mint: str, risk_score: float, next_check: float) -> None:
+        with self._lock:
+            entry = self._entries.get((chat_id, mint))
+            if entry is None:
+                return
+            self._db().execute(
+                "UPDATE watchlist SET risk_score = ?, next_check = ? WHERE chat_id = ? AND mint = ?",
+                (risk_score, next_check, chat_id, mint),
+            )
+            entry.update(risk_score=risk_score, next_check=next_check)
+
+    def remove(self, chat_id: int, mint: str) -> bool:
+        with self._lock:
+            self._db().execute("DELETE FROM watchlist WHERE chat_id = ? AND mint = ?", (chat_id, mint))
+            return self._entries.pop((chat_id, mint), None) is not None
+
+    def due(self, now: float) -> List[Dict[str, Any]]:
+        """Entries whose next check time has passed"""
+        with self._lock:
+            self._db()
+            return [dict(e) for e in self._entries.values() if e["next_check"] <= now]
+
+    def all(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._db()
+            return [dict(e) for e in self._entries.values()]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+watchlist = WatchlistStore(WALLET_DB)
+
+class CoinCacheStore:
+    """pump.fun coin documents with their fetch time, kept on disk across restarts.
+
+    Lives in its own database (not the wallet store) with synchronous=NORMAL.
+    put() only buffers; flush() writes the buffer in one transaction and is
+    meant to run off the event loop. Rows older than max_age are never
+    served and are evicted, as are the oldest rows beyond max_entries;
+    eviction runs on open and every 100 writes.
+    """
+
+    def __init__(self, path: str, max_age: float, max_entries: int):
+        self.path = path
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: Dict[str, tuple[str, float]] = {}
+        self._writes = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS coin_cache ("
+                "mint TEXT PRIMARY KEY, data TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS coin_cache_fetched_at ON coin_cache (fetched_at)")
+            self._conn = conn
+            self.evict()
+        return self._conn
+
+    def get(self, mint: str) -> Optional[tuple[Dict[str, Any], float]]:
+        """(document, fetched_at) if a copy younger than max_age exists"""
+        with self._lock:
+            row = self._pending.get(mint) or self._db().execute(
+                "SELECT data, fetched_at FROM coin_cache WHERE mint = ?", (mint,)
+            ).fetchone()
+        if row is None or row[1] <= time.time() - self.max_age:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, mint: str, data: Dict[str, Any], fetched_at: float) -> None:
+        """Buffer a document until the next flush()"""
+        with self._lock:
+            self._pending[mint] = (json.dumps(data), fetched_at)
+
+    def flush(self) -> None:
+        """Write every buffered document in one transaction"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            conn = self._db()
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT OR REPLACE INTO coin_cache (mint, data, fetched_at) VALUES (?, ?, ?)",
+                [(mint, data, fetched_at) for mint, (data, fetched_at) in pending.items()],
+            )
+            conn.execute("COMMIT")
+            before, self._writes = self._writes, self._writes + len(pending)
+            if before // 100 != self._writes // 100:
+                self.evict()
+
+    def evict(self) -> None:
+        with self._lock:
+            conn = self._db()
+            conn.execute("DELETE FROM coin_cache WHERE fetched_at <= ?", (time.time() - self.max_age,))
+            conn.execute(
+                "DELETE FROM coin_cache WHERE mint NOT IN "
+                "(SELECT mint FROM coin_cache ORDER BY fetched_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._db().execute("DELETE FROM coin_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+coin_cache = CoinCacheStore(COIN_CACHE_DB, COIN_CACHE_MAX_AGE, COIN_CACHE_MAX_ENTRIES)
+
 def load_wallets() -> list:
-    """Load wallets from JSON file with error handling"""
+    """All wallets from the wallet store"""
     try:
-        if not os.path.exists(WALLET_FILE):
-            with open(WALLET_FILE, "w") as f:
-                json.dump([], f)
-        with open(WALLET_FILE, "r") as f:
-            return json.load(f)
+        return wallet_store.all()
     except Exception as e:
         logger.error(f"Error loading wallets: {e}")
         return []
 
-def save_wallets(wallets: list) -> bool:
-    """Save wallets to JSON file with error handling"""
-    try:
-        with open(WALLET_FILE, "w") as f:
-            json.dump(wallets, f, indent=2)
-        return True
-    except Exception as e:
-        logger.error(f"Error saving wallets: {e}")
-        return False
-
 def get_or_create_wallet_for_token(ca: str) -> Dict[str, Any]:
     """Get or create wallet for specific token"""
-    wallets = load_wallets()
-    for w in wallets:
-        if ca in w.get("used_for", []):
-            return w
-    
     try:
-        kp = Keypair()
-        wallet = {
-            "address": str(kp.pubkey()),
-            "private_key": kp.to_base58_string(),
-            "used_for": [ca],
-            "created_at": datetime.now().isoformat()
-        }
-        wallets.append(wallet)
-        if save_wallets(wallets):
-            return wallet
-        else:
-            raise Exception("Failed to save wallet")
+        return wallet_store.get_or_create(ca)
     except Exception as e:
         logger.error(f"Error creating wallet: {e}")
         raise
 
+async def wallet_for_token(ca: str) -> Dict[str, Any]:
+    """get_or_create_wallet_for_token for handlers: known wallets come from memory,
+    creating one (a durable SQLite commit) runs in a worker thread"""
+    wallet = wallet_store.get_for_token(ca)
+    if wallet is not None:
+        return wallet
+    return await asyncio.to_thread(get_or_create_wallet_for_token, ca)
+
 async def human_delay():
     """Random human-like delay"""
     await asyncio.sleep(random.uniform(0.5, 3.0))
@@ -352,34 +1053,678 @@ def get_random_amount(base: float) -> float:
     amount = base + random.uniform(-variation, variation)
     return max(0.001, min(amount, MAX_SOL_PER_TRADE))
 
-async def get_working_rpc() -> str:
-    """Get a working RPC endpoint with health check"""
-    for rpc in random.sample(RPC_NODES, len(RPC_NODES)):
+# 🗄️ Rug check result cache
+rug_cache = TTLCache(max_size=RUG_CACHE_MAX_SIZE, ttl=RUG_CACHE_TTL)
+
+# 🔀 Single-flight coalescing of concurrent lookups
+class SingleFlight:
+    """Share one in-flight upstream call between all concurrent callers of a key"""
+
+    def __init__(self):
+        self._inflight: Dict[Any, asyncio.Task] = {}
+
+    async def do(self, key: Any, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the call already running for key, or start it.
+
+        Waiters are shielded from each other: cancelling one caller does not
+        cancel the shared call, and its exception is raised in every waiter.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Any, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved when every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+inflight = SingleFlight()
+
+# 🧵 Tracked background work
+class BackgroundTasks:
+    """Fire-and-forget tasks, at most one per key, kept referenced until done and cancelled on shutdown"""
+
+    def __init__(self):
+        self._tasks: Dict[Any, asyncio.Task] = {}
+
+    def spawn(self, key: Any, fn: Callable[[], Awaitable[Any]]) -> bool:
+        """Start fn() in the background unless a task for key is still running"""
+        if key in self._tasks:
+            return False
+        task = asyncio.ensure_future(fn())
+        self._tasks[key] = task
+        task.add_done_callback(lambda t: self._tasks.pop(key, None))
+        return True
+
+    def pending(self, kind: str) -> int:
+        """Running tasks whose key is a tuple starting with kind"""
+        return sum(1 for key in self._tasks if isinstance(key, tuple) and key[0] == kind)
+
+    async def cancel_all(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+background = BackgroundTasks()
+
+# 🔌 Pooled HTTP sessions
+class HttpSessionPool:
+    """One long-lived, keep-alive aiohttp session per upstream host"""
+
+    def __init__(self, limit_per_host: int, keepalive_timeout: float, dns_cache_ttl: int):
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+
+    def get(self, url: str) -> aiohttp.ClientSession:
+        """Return the session for the url's host, creating it on first use"""
+        host = urlsplit(url).netloc
+        session = self._sessions.get(host)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[host] = session
+        return session
+
+    async def start(self, urls: List[str]) -> None:
+        """Open sessions for the known upstreams up front"""
+        for url in urls:
+            self.get(url)
+
+    async def close(self) -> None:
+        """Close every session and its pooled connections"""
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        await asyncio.gather(*(s.close() for s in sessions), return_exceptions=True)
+
+http_pool = HttpSessionPool(HTTP_LIMIT_PER_HOST, HTTP_KEEPALIVE_TIMEOUT, HTTP_DNS_CACHE_TTL)
+
+# 🩺 Background RPC health tracking
+class RpcNodeStats:
+    """Rolling health figures for one RPC node"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.latency_ms: Optional[float] = None
+        self.error_rate = 0.0
+        self.slot = 0
+        self.healthy = False
+        self.probed = False
+        self.last_error: Optional[str] = None
+        self.samples: deque = deque(maxlen=RPC_LATENCY_SAMPLES)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile (ms) over recent real calls, None until enough samples"""
+        if len(self.samples) < RPC_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def record(self, latency_ms: Optional[float], ok: bool, alpha: float) -> None:
+        """Fold one observation into the EWMA latency and error rate"""
+        if ok and latency_ms is not None:
+            if self.latency_ms is None:
+                self.latency_ms = latency_ms
+            else:
+                self.latency_ms = alpha * latency_ms + (1 - alpha) * self.latency_ms
+        self.error_rate = alpha * (0.0 if ok else 1.0) + (1 - alpha) * self.error_rate
+
+class RpcHealthTracker:
+    """Probes every RPC node in the background and ranks them by latency, errors and slot lag"""
+
+    def __init__(self, nodes: List[str], interval: float, timeout: float, alpha: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.alpha = alpha
+        self.nodes: Dict[str, RpcNodeStats] = {url: RpcNodeStats(url) for url in nodes}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the probe loop on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.error(f"RPC health probe error: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def probe_all(self) -> None:
+        await asyncio.gather(*(self._probe(stats) for stats in self.nodes.values()))
+
+    async def _rpc(self, url: str, method: str) -> Dict[str, Any]:
+        session = http_pool.get(url)
+        payload = {"jsonrpc": "2.0", "id": 1, "method": method}
+        async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def _probe(self, stats: RpcNodeStats) -> None:
+        started = time.monotonic()
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                async with session.get(rpc, json={"jsonrpc": "2.0", "id": 1, "method": "getHealth"}) as response:
-                    if response.status == 200:
-                        return rpc
-        except:
+            health, slot = await asyncio.gather(self._rpc(stats.url, "getHealth"), self._rpc(stats.url, "getSlot"))
+            latency_ms = (time.monotonic() - started) * 1000
+            if "error" in slot:
+                raise RuntimeError(slot["error"].get("message", "getSlot failed"))
+            stats.slot = int(slot["result"])
+            stats.healthy = health.get("result") == "ok"
+            stats.last_error = None if stats.healthy else health.get("error", {}).get("message", "unhealthy")
+            stats.record(latency_ms, stats.healthy, self.alpha)
+        except Exception as e:
+            stats.healthy = False
+            stats.last_error = str(e) or type(e).__name__
+            stats.record(None, False, self.alpha)
+        stats.probed = True
+        metrics.observe("rpc_probe", time.monotonic() - started, upstream=upstream_label(stats.url),
+                        outcome="ok" if stats.healthy else "error")
+
+    def observe(self, url: str, latency: float, ok: bool) -> None:
+        """Record the outcome of a real RPC call (latency in seconds)"""
+        stats = self.nodes.get(url)
+        if stats:
+            stats.record(latency * 1000, ok, self.alpha)
+            if ok:
+                stats.samples.append(latency * 1000)
+
+    def hedge_delay(self, url: str) -> float:
+        """Seconds to wait on a node before hedging: its p90, clamped to the configured range"""
+        stats = self.nodes.get(url)
+        p90 = stats.percentile(0.9) if stats else None
+        delay_ms = RPC_HEDGE_MAX_DELAY_MS if p90 is None else min(max(p90, RPC_HEDGE_MIN_DELAY_MS), RPC_HEDGE_MAX_DELAY_MS)
+        return delay_ms / 1000
+
+    def tip_slot(self) -> int:
+        return max((stats.slot for stats in self.nodes.values()), default=0)
+
+    def slot_lag(self, url: str) -> int:
+        return self.tip_slot() - self.nodes[url].slot
+
+    def score(self, stats: RpcNodeStats) -> float:
+        """Lower is better: EWMA latency inflated by errors, plus a slot-lag penalty"""
+        latency = stats.latency_ms if stats.latency_ms is not None else self.timeout * 1000
+        lag = self.tip_slot() - stats.slot
+        return latency * (1 + 4 * stats.error_rate) + lag * RPC_SLOT_LAG_PENALTY_MS
+
+    def ranked(self) -> List[str]:
+        """Healthy nodes best-first, followed by the rest in configured order"""
+        tip = self.tip_slot()
+        healthy = [
+            stats for stats in self.nodes.values()
+            if stats.healthy and tip - stats.slot <= RPC_MAX_SLOT_LAG
+        ]
+        healthy.sort(key=self.score)
+        ordered = [stats.url for stats in healthy]
+        return ordered + [url for url in self.nodes if url not in ordered]
+
+    def best(self) -> str:
+        return self.ranked()[0]
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-node figures for diagnostics"""
+        tip = self.tip_slot()
+        return [
+            {
+                "url": stats.url,
+                "healthy": stats.healthy,
+                "latency_ms": stats.latency_ms,
+                "error_rate": stats.error_rate,
+                "slot_lag": tip - stats.slot if stats.probed and stats.slot else None,
+                "last_error": stats.last_error,
+            }
+            for stats in self.nodes.values()
+        ]
+
+rpc_health = RpcHealthTracker(RPC_NODES, RPC_HEALTH_INTERVAL, RPC_HEALTH_TIMEOUT, RPC_EWMA_ALPHA)
+
+# 🚰 Per-upstream rate limits
+class AsyncTokenBucket:
+    """Token bucket that waits for capacity instead of refusing; waiters are served in order"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, cost: float = 1.0) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return
+                await asyncio.sleep((cost - self._tokens) / self.rate)
+
+upstream_limits: Dict[str, AsyncTokenBucket] = {}
+
+def get_upstream_limiter(name: str) -> AsyncTokenBucket:
+    """Quota for an upstream (RPC url or "pump.fun"), created on first use"""
+    limiter = upstream_limits.get(name)
+    if limiter is None:
+        if name == "pump.fun":
+            limiter = AsyncTokenBucket(PUMP_API_RATE_LIMIT, PUMP_API_RATE_BURST)
+        else:
+            limiter = AsyncTokenBucket(*RPC_NODE_LIMITS.get(upstream_label(name), (RPC_RATE_LIMIT, RPC_RATE_BURST)))
+        upstream_limits[name] = limiter
+    return limiter
+
+# ✏️ Paced, debounced Telegram message updates
+class MessageUpdater:
+    """Sends and edits bot messages within Telegram's flood limits.
+
+    progress() only records the newest text for a message; the message is
+    edited at most once per `debounce` seconds with whatever is newest by
+    then. edit() delivers a final text right away, dropping any progress
+    still pending, and raises if it cannot be delivered. Every send waits
+    for a per-chat and a global token bucket, edits that would not change
+    the text are skipped, and RetryAfter is waited out and retried.
+    """
+
+    def __init__(self, debounce: float, chat_rate: float, chat_burst: float, global_rate: float,
+                 max_retries: int, max_chats: int = 10000):
+        self.debounce = debounce
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self.max_chats = max_chats
+        self.global_limit = AsyncTokenBucket(global_rate, global_rate)
+        self._chat_limits: OrderedDict = OrderedDict()  # chat_id -> AsyncTokenBucket
+        self._shown = TTLCache(max_size=max_chats, ttl=3600)  # (chat_id, message_id) -> (text, parse_mode)
+        self._pending: Dict[tuple, tuple] = {}  # (chat_id, message_id) -> (message, text, parse_mode)
+        self._timers: Dict[tuple, asyncio.Task] = {}
+        self._locks: Dict[tuple, asyncio.Lock] = {}
+        self._lock_users: Dict[tuple, int] = {}
+
+    async def reply(self, message: Message, text: str, parse_mode: Optional[str] = None) -> Message:
+        """Paced reply to `message`"""
+        sent = await self._call(message.chat_id, lambda: message.reply_text(text, parse_mode=parse_mode))
+        self._shown.set((sent.chat_id, sent.message_id), (text, parse_mode))
+        return sent
+
+    async def send(self, bot, chat_id: int, text: str, parse_mode: Optional[str] = None) -> Message:
+        """Paced new message to a chat"""
+        sent = await self._call(chat_id, lambda: bot.send_message(chat_id, text, parse_mode=parse_mode))
+        self._shown.set((sent.chat_id, sent.message_id), (text, parse_mode))
+        return sent
+
+    def progress(self, message: Message, text: str, parse_mode: Optional[str] = None) -> None:
+        """Schedule an intermediate edit; rapid updates to one message collapse into the latest"""
+        key = (message.chat_id, message.message_id)
+        if key in self._pending:
+            metrics.inc("message_updates", result="coalesced")
+        self._pending[key] = (message, text, parse_mode)
+        if key not in self._timers:
+            self._timers[key] = asyncio.create_task(self._flush_later(key))
+
+    async def edit(self, message: Message, text: str, parse_mode: Optional[str] = None) -> None:
+        """Deliver the final text of a message now, superseding pending progress"""
+        key = (message.chat_id, message.message_id)
+        if self._pending.pop(key, None) is not None:
+            metrics.inc("message_updates", result="coalesced")
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        async with self._serialized(key):
+            await self._edit(message, text, parse_mode)
+
+    async def _flush_later(self, key: tuple) -> None:
+        try:
+            await asyncio.sleep(self.debounce)
+        finally:
+            if self._timers.get(key) is asyncio.current_task():
+                del self._timers[key]
+        async with self._serialized(key):
+            pending = self._pending.pop(key, None)
+            if pending is None:
+                return
+            message, text, parse_mode = pending
+            try:
+                await self._edit(message, text, parse_mode)
+            except Exception as e:
+                logger.warning(f"Progress update for chat {message.chat_id} failed: {e}")
+
+    async def _edit(self, message: Message, text: str, parse_mode: Optional[str]) -> None:
+        key = (message.chat_id, message.message_id)
+        if self._shown.get(key) == (text, parse_mode):
+            metrics.inc("message_updates", result="unchanged")
+            return
+        try:
+            await self._call(message.chat_id, lambda: message.edit_text(text, parse_mode=parse_mode))
+        except BadRequest as e:
+            if "not modified" not in str(e).lower():
+                raise
+        self._shown.set(key, (text, parse_mode))
+
+    async def _call(self, chat_id: int, request: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a Bot API call within the chat and global budgets, waiting out flood control"""
+        for attempt in range(self.max_retries + 1):
+            await self._chat_limit(chat_id).acquire()
+            await self.global_limit.acquire()
+            try:
+                result = await request()
+            except RetryAfter as e:
+                if attempt == self.max_retries:
+                    metrics.inc("message_updates", result="flood_failed")
+                    raise
+                delay = e.retry_after.total_seconds() if isinstance(e.retry_after, timedelta) else e.retry_after
+                metrics.inc("message_updates", result="flood_wait")
+                logger.warning(f"Telegram flood control for chat {chat_id}, retrying in {delay}s")
+                await asyncio.sleep(delay)
+                continue
+            metrics.inc("message_updates", result="sent")
+            return result
+
+    def _chat_limit(self, chat_id: int) -> AsyncTokenBucket:
+        limiter = self._chat_limits.pop(chat_id, None)
+        if limiter is None:
+            limiter = AsyncTokenBucket(self.chat_rate, self.chat_burst)
+        self._chat_limits[chat_id] = limiter
+        while len(self._chat_limits) > self.max_chats:
+            self._chat_limits.popitem(last=False)
+        return limiter
+
+    @asynccontextmanager
+    async def _serialized(self, key: tuple):
+        """One delivery at a time per message, so edits land in the order they were made"""
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[key] -= 1
+            if not self._lock_users[key]:
+                del self._lock_users[key]
+                del self._locks[key]
+
+message_updater = MessageUpdater(EDIT_DEBOUNCE, TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST, TELEGRAM_GLOBAL_RATE,
+                                 TELEGRAM_MAX_RETRIES)
+
+# ⚡ Per-endpoint circuit breakers
+class CircuitBreaker:
+    """Closed/open/half-open breaker driven by the failure rate over recent calls"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, window: int, min_calls: int, failure_rate: float, cooldown: float):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self._outcomes: deque = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+
+    def available(self) -> bool:
+        """Whether a call could go through right now (does not claim the half-open probe)"""
+        if self.state == self.OPEN:
+            return time.monotonic() - self._opened_at >= self.cooldown
+        return not (self.state == self.HALF_OPEN and self._probing)
+
+    def allow(self) -> bool:
+        """Claim permission for one call; after the cool-down a single probe is let through"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self.state = self.HALF_OPEN
+            self._probing = False
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        if self.state == self.HALF_OPEN:
+            logger.info(f"Circuit {self.name} closed")
+            self.state = self.CLOSED
+            self._outcomes.clear()
+            self._probing = False
+            return
+        self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        if self.state == self.HALF_OPEN:
+            self._trip()
+            return
+        self._outcomes.append(False)
+        failures = self._outcomes.count(False)
+        if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+            self._trip()
+
+    def release(self) -> None:
+        """Give back a claimed half-open probe without recording an outcome"""
+        self._probing = False
+
+    def _trip(self) -> None:
+        if self.state != self.OPEN:
+            logger.warning(f"Circuit {self.name} opened for {self.cooldown:.0f}s")
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probing = False
+        self._outcomes.clear()
+
+breakers: Dict[str, CircuitBreaker] = {}
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Breaker for an upstream (RPC url or API name), created on first use"""
+    breaker = breakers.get(name)
+    if breaker is None:
+        breaker = CircuitBreaker(name, BREAKER_WINDOW, BREAKER_MIN_CALLS, BREAKER_FAILURE_RATE, BREAKER_COOLDOWN)
+        breakers[name] = breaker
+    return breaker
+
+class HedgeBudget:
+    """Per-minute allowance of hedged requests, with counters on how they went"""
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self._spent: deque = deque()
+        self.sent = 0      # backup requests issued
+        self.won = 0       # backup answered first (hedge helped)
+        self.wasted = 0    # primary answered first anyway
+        self.denied = 0    # hedge wanted but budget exhausted
+
+    def try_spend(self) -> bool:
+        now = time.monotonic()
+        while self._spent and now - self._spent[0] >= 60:
+            self._spent.popleft()
+        if len(self._spent) >= self.per_minute:
+            self.denied += 1
+            return False
+        self._spent.append(now)
+        self.sent += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        decided = self.won + self.wasted
+        return {
+            "sent": self.sent, "won": self.won, "wasted": self.wasted, "denied": self.denied,
+            "win_rate": self.won / decided if decided else 0.0,
+            "budget_left": max(self.per_minute - len(self._spent), 0),
+        }
+
+hedge_budget = HedgeBudget(RPC_HEDGE_BUDGET_PER_MIN)
+
+async def _rpc_attempt(rpc: str, operation: Callable[[str], Awaitable[Any]],
+                       sent: Optional[asyncio.Event] = None) -> Any:
+    """One call on one node, recorded in its breaker and health stats (breaker already allowed).
+
+    `sent` is set once the node's quota is acquired and the request goes out.
+    """
+    breaker = get_breaker(rpc)
+    try:
+        with metrics.timer("quota_wait", upstream=upstream_label(rpc)):
+            await get_upstream_limiter(rpc).acquire()
+    except BaseException:
+        breaker.release()
+        raise
+    if sent is not None:
+        sent.set()
+    started = time.monotonic()
+    try:
+        with metrics.timer("upstream", upstream=upstream_label(rpc)):
+            result = await operation(rpc)
+    except asyncio.CancelledError:
+        breaker.release()
+        raise
+    except Exception as e:
+        breaker.record_failure()
+        rpc_health.observe(rpc, time.monotonic() - started, False)
+        logger.warning(f"RPC call failed on {rpc}: {e}")
+        raise
+    breaker.record_success()
+    rpc_health.observe(rpc, time.monotonic() - started, True)
+    return result
+
+async def rpc_call(operation: Callable[[str], Awaitable[Any]], hedge: bool = RPC_HEDGE_READS) -> Any:
+    """Run a read against the best RPC node, failing over in health-rank order.
+
+    Nodes whose breaker is open are skipped without a network call, so a
+    dead node costs nothing until its cool-down expires. With hedge=True
+    (read-only calls only) a node that has not answered within its p90
+    latency gets a backup request to the next node, budget permitting;
+    the first good answer wins and the other request is cancelled. The
+    hedge timer starts once the request has left our own quota limiter.
+    """
+    last_error: Optional[Exception] = None
+    nodes = rpc_health.ranked()
+    tried = set()
+    for rpc in nodes:
+        if rpc in tried or not get_breaker(rpc).allow():
             continue
-    return RPC_NODES[0]  # Fallback to first RPC
+        tried.add(rpc)
+        sent = asyncio.Event()
+        primary = asyncio.ensure_future(_rpc_attempt(rpc, operation, sent))
+        pending = {primary}
+        backup = None
+        try:
+            if hedge:
+                dispatched = asyncio.ensure_future(sent.wait())
+                try:
+                    await asyncio.wait({primary, dispatched}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    dispatched.cancel()
+                done, _ = await asyncio.wait(pending, timeout=rpc_health.hedge_delay(rpc))
+                if not done:
+                    backup_rpc = next((url for url in nodes if url not in tried and get_breaker(url).allow()), None)
+                    if backup_rpc is not None:
+                        if hedge_budget.try_spend():
+                            tried.add(backup_rpc)
+                            backup = asyncio.ensure_future(_rpc_attempt(backup_rpc, operation))
+                            pending.add(backup)
+                        else:
+                            # Not hedged: the node stays available for failover
+                            get_breaker(backup_rpc).release()
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if backup is not None:
+                            if task is backup:
+                                hedge_budget.won += 1
+                            else:
+                                hedge_budget.wasted += 1
+                        return task.result()
+                    last_error = task.exception()
+        finally:
+            for task in (primary, backup):
+                if task is None:
+                    continue
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # a loser's failure is already logged
+    raise last_error or CircuitOpenError("All RPC circuits are open")
+
+# 📡 Non-blocking RPC clients
+class AsyncRpcPool:
+    """One pooled AsyncClient per RPC endpoint, shared by every handler"""
+
+    def __init__(self, commitment: str, timeout: float):
+        self.commitment = Commitment(commitment)
+        self.timeout = timeout
+        self._clients: Dict[str, AsyncClient] = {}
+
+    def get(self, url: str) -> AsyncClient:
+        client = self._clients.get(url)
+        if client is None:
+            client = AsyncClient(url, commitment=self.commitment, timeout=self.timeout)
+            self._clients[url] = client
+        return client
+
+    async def close(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        await asyncio.gather(*(c.close() for c in clients), return_exceptions=True)
+
+rpc_pool = AsyncRpcPool(RPC_COMMITMENT, RPC_TIMEOUT)
+
+async def get_latest_blockhash():
+    """Latest blockhash from the best available node"""
+    response = await rpc_call(lambda rpc: rpc_pool.get(rpc).get_latest_blockhash())
+    return response.value.blockhash
+
+async def get_working_rpc() -> str:
+    """Best RPC endpoint from the background health tracker (no network call)"""
+    ranked = rpc_health.ranked()
+    for rpc in ranked:
+        if get_breaker(rpc).available():
+            return rpc
+    return ranked[0]
 
 # 🧨 Enhanced MEV transaction with retry
 async def send_mev_transaction(signed_tx: VersionedTransaction, max_retries: int = 3) -> str:
     """Send transaction via Jito with retry logic"""
-    url = "https://mainnet.block-engine.jito.wtf/api/v1/bundles"
+    url = JITO_BUNDLE_URL
     raw_tx = bytes(signed_tx)
     encoded = base64.b64encode(raw_tx).decode('utf-8')
     payload = {"jsonrpc": "2.0", "id": 1, "method": "sendBundle", "params": [{"data": [encoded]}]}
     
     for attempt in range(max_retries):
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
-                async with session.post(url, json=payload) as response:
-                    result = await response.json()
-                    if "error" in result:
-                        raise TransactionError(f"Jito error: {result['error']}")
-                    return result["result"]["bundleId"]
+            session = http_pool.get(url)
+            async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                result = await response.json()
+                if "error" in result:
+                    raise TransactionError(f"Jito error: {result['error']}")
+                return result["result"]["bundleId"]
         except Exception as e:
             if attempt == max_retries - 1:
                 raise TransactionError(f"Transaction failed after {max_retries} attempts: {str(e)}")
@@ -421,16 +1766,13 @@ def create_sell_ix(seller: Pubkey, mint: Pubkey, token_amount: int) -> Dict[str,
 # 🛠️ Enhanced execute functions
 async def execute_buy(ca: str, sol_amount: float, pk: str) -> str:
     """Execute buy transaction with improved error handling"""
-    rpc = await get_working_rpc()
-    client = Client(rpc)
-    
     try:
         buyer = Keypair.from_base58_string(pk)
         mint = Pubkey.from_string(ca)
         lamports = int(sol_amount * 1_000_000_000)
         
         ix = create_buy_ix(buyer.pubkey(), mint, lamports)
-        bh = client.get_latest_blockhash().value.blockhash
+        bh = await get_latest_blockhash()
         msg = MessageV0.try_compile(
             payer=buyer.pubkey(), 
             instructions=[ix], 
@@ -448,15 +1790,12 @@ async def execute_buy(ca: str, sol_amount: float, pk: str) -> str:
 
 async def execute_sell(ca: str, token_amount: int, pk: str) -> str:
     """Execute sell transaction with improved error handling"""
-    rpc = await get_working_rpc()
-    client = Client(rpc)
-    
     try:
         seller = Keypair.from_base58_string(pk)
         mint = Pubkey.from_string(ca)
         
         ix = create_sell_ix(seller.pubkey(), mint, token_amount)
-        bh = client.get_latest_blockhash().value.blockhash
+        bh = await get_latest_blockhash()
         msg = MessageV0.try_compile(
             payer=seller.pubkey(), 
             instructions=[ix], 
@@ -472,85 +1811,676 @@ async def execute_sell(ca: str, token_amount: int, pk: str) -> str:
         logger.error(f"Sell execution error: {e}")
         raise TransactionError(f"Sell failed: {str(e)}")
 
+# 🧱 SPL Token account decoding
+class TokenAccountInfo(NamedTuple):
+    mint: Pubkey
+    owner: Pubkey
+    amount: int
+    state: str
+
+class MintInfo(NamedTuple):
+    supply: int
+    decimals: int
+    is_initialized: bool
+    mint_authority: Optional[Pubkey]
+    freeze_authority: Optional[Pubkey]
+
+class BondingCurve(NamedTuple):
+    virtual_token_reserves: int
+    virtual_sol_reserves: int  # lamports
+    real_token_reserves: int
+    real_sol_reserves: int  # lamports
+    token_total_supply: int
+    complete: bool
+
+    @property
+    def price_sol(self) -> float:
+        """SOL per whole token at the current virtual reserves"""
+        if not self.virtual_token_reserves:
+            return 0.0
+        return (self.virtual_sol_reserves / 1_000_000_000) / (self.virtual_token_reserves / 10 ** PUMP_TOKEN_DECIMALS)
+
+    @property
+    def market_cap_sol(self) -> float:
+        return self.price_sol * self.token_total_supply / 10 ** PUMP_TOKEN_DECIMALS
+
+    @property
+    def liquidity_sol(self) -> float:
+        return self.real_sol_reserves / 1_000_000_000
+
+    @property
+    def progress(self) -> float:
+        """Share of the initially sellable tokens already bought; 1.0 once the curve completed"""
+        if self.complete:
+            return 1.0
+        return min(max(1 - self.real_token_reserves / PUMP_INITIAL_REAL_TOKEN_RESERVES, 0.0), 1.0)
+
+    def sell_quote_sol(self, raw_amount: int) -> float:
+        """SOL a sell of raw_amount returns on the constant-product curve, before fees"""
+        if raw_amount <= 0 or not self.virtual_token_reserves:
+            return 0.0
+        lamports = self.virtual_sol_reserves * raw_amount // (self.virtual_token_reserves + raw_amount)
+        return min(lamports, self.real_sol_reserves) / 1_000_000_000
+
+class TokenBalance(NamedTuple):
+    amount: int  # raw base units
+    decimals: int
+    sol: float
+    curve: Optional[BondingCurve] = None
+
+    @property
+    def ui_amount(self) -> float:
+        return self.to_ui(self.amount)
+
+    @property
+    def value_sol(self) -> Optional[float]:
+        """What the position fetches on the bonding curve; None off-curve or once it completed"""
+        if self.curve is None or self.curve.complete:
+            return None
+        return self.curve.sell_quote_sol(self.amount)
+
+    def to_ui(self, raw: int) -> float:
+        """Scale a raw token amount by the mint's decimals"""
+        return raw / 10 ** self.decimals
+
+def _decode_coption_pubkey(data: bytes, offset: int) -> Optional[Pubkey]:
+    """COption<Pubkey>: u32 tag followed by 32 bytes"""
+    tag = struct.unpack_from("<I", data, offset)[0]
+    return Pubkey.from_bytes(data[offset + 4:offset + 36]) if tag else None
+
+def decode_token_account(data: bytes) -> TokenAccountInfo:
+    """Decode an SPL token account (mint, owner, amount at offset 64, state)"""
+    if len(data) < TOKEN_ACCOUNT_SIZE:
+        raise ValueError(f"Token account data too short: {len(data)} bytes")
+    return TokenAccountInfo(
+        mint=Pubkey.from_bytes(data[0:32]),
+        owner=Pubkey.from_bytes(data[32:64]),
+        amount=struct.unpack_from("<Q", data, TOKEN_AMOUNT_OFFSET)[0],
+        state=TOKEN_ACCOUNT_STATES.get(data[108], "unknown"),
+    )
+
+def decode_mint_account(data: bytes) -> MintInfo:
+    """Decode an SPL mint account (supply, decimals, authorities)"""
+    if len(data) < MINT_ACCOUNT_SIZE:
+        raise ValueError(f"Mint account data too short: {len(data)} bytes")
+    return MintInfo(
+        supply=struct.unpack_from("<Q", data, 36)[0],
+        decimals=data[MINT_DECIMALS_OFFSET],
+        is_initialized=bool(data[45]),
+        mint_authority=_decode_coption_pubkey(data, 0),
+        freeze_authority=_decode_coption_pubkey(data, 46),
+    )
+
+def decode_bonding_curve(data: bytes, offset: int = BONDING_CURVE_OFFSET) -> BondingCurve:
+    """Decode pump.fun bonding-curve fields starting at `offset` (0 for a sliced read)"""
+    if len(data) < offset + BONDING_CURVE_SIZE:
+        raise ValueError(f"Bonding curve data too short: {len(data)} bytes")
+    *reserves, complete = struct.unpack_from("<5Q?", data, offset)
+    return BondingCurve(*reserves, complete)
+
+def read_bonding_curve(account: Any, offset: int = BONDING_CURVE_OFFSET) -> Optional[BondingCurve]:
+    """Curve from a fetched account, None if it is missing or not a pump.fun curve"""
+    if account is None or account.owner != PUMP_FUN_PROGRAM_ID:
+        return None
+    try:
+        return decode_bonding_curve(account.data, offset)
+    except ValueError:
+        return None
+
+# Decimals never change for a mint, so they are cached for the process lifetime
+mint_decimals = TTLCache(max_size=4096, ttl=float("inf"))
+
+# mint -> (slot, curve or None); a curve is reused until a newer slot is seen or BONDING_CURVE_TTL passes
+bonding_curves = TTLCache(max_size=4096, ttl=BONDING_CURVE_TTL)
+
+def cached_bonding_curve(mint: str) -> Optional[tuple[int, Optional[BondingCurve]]]:
+    entry = bonding_curves.get(mint)
+    if entry is None or entry[0] < rpc_health.tip_slot():
+        return None
+    return entry
+
+def cache_bonding_curve(mint: str, slot: int, curve: Optional[BondingCurve]) -> None:
+    """Keep the newest read: a lagging node must not replace a curve from a later slot"""
+    entry = bonding_curves.get(mint)
+    if entry is None or slot >= entry[0]:
+        bonding_curves.set(mint, (slot, curve))
+
 # 🔍 Enhanced token balance function
+async def get_token_position(ca: str, wallet_addr: str) -> TokenBalance:
+    """Token balance (with decimals) and SOL balance; a failed read shows as an empty position"""
+    try:
+        return await read_token_position(ca, wallet_addr)
+    except Exception as e:
+        logger.error(f"Balance check error: {e}")
+        return TokenBalance(0, 0, 0.0)
+
+async def read_token_position(ca: str, wallet_addr: str) -> TokenBalance:
+    """Like get_token_position, but raises when the balance cannot be read"""
+    return await inflight.do(("balance", ca, wallet_addr), lambda: fetch_token_position(ca, wallet_addr))
+
 async def get_token_balance(ca: str, wallet_addr: str) -> tuple[int, float]:
-    """Get both token balance and SOL balance"""
-    rpc = await get_working_rpc()
-    client = Client(rpc)
-    
+    """Get both raw token balance and SOL balance"""
+    position = await get_token_position(ca, wallet_addr)
+    return position.amount, position.sol
+
+async def fetch_token_position(ca: str, wallet_addr: str) -> TokenBalance:
+    return (await get_token_balances([(ca, wallet_addr)]))[0]
+
+@functools.lru_cache(maxsize=ATA_CACHE_SIZE)
+def derive_ata(wallet: Pubkey, mint: Pubkey) -> Pubkey:
+    """Associated token account of a wallet for a mint (memoized bump-seed search)"""
+    return Pubkey.find_program_address(
+        [bytes(wallet), bytes(TOKEN_PROGRAM_ID), bytes(mint)],
+        ASSOCIATED_TOKEN_PROGRAM_ID
+    )[0]
+
+@functools.lru_cache(maxsize=ATA_CACHE_SIZE)
+def derive_bonding_curve(mint: Pubkey) -> Pubkey:
+    """pump.fun bonding-curve account of a mint"""
+    return Pubkey.find_program_address([b"bonding-curve", bytes(mint)], PUMP_FUN_PROGRAM_ID)[0]
+
+def warm_ata_cache() -> int:
+    """Pre-derive the ATA of every known (wallet, mint) position"""
+    warmed = 0
+    for wallet in load_wallets():
+        try:
+            owner = Pubkey.from_string(wallet["address"])
+            for ca in wallet.get("used_for", []):
+                derive_ata(owner, Pubkey.from_string(ca))
+                warmed += 1
+        except Exception as e:
+            logger.warning(f"Skipping ATA warm-up for {wallet.get('address')}: {e}")
+    return warmed
+
+async def get_multiple_accounts(pubkeys: List[Pubkey], data_slice: Optional[DataSliceOpts] = None) -> list:
+    """Fetch many accounts with getMultipleAccounts, chunked to the RPC limit.
+
+    Chunks are sent concurrently; the result is in the same order as pubkeys,
+    with None for accounts that do not exist. data_slice applies to every account.
+    """
+    return (await get_multiple_accounts_at(pubkeys, data_slice))[1]
+
+async def get_multiple_accounts_at(pubkeys: List[Pubkey], data_slice: Optional[DataSliceOpts] = None) -> tuple[int, list]:
+    """get_multiple_accounts plus the slot the read reflects (the oldest chunk's)"""
+    chunks = [pubkeys[i:i + RPC_MAX_ACCOUNTS_PER_CALL] for i in range(0, len(pubkeys), RPC_MAX_ACCOUNTS_PER_CALL)]
+
+    async def fetch(chunk: List[Pubkey]) -> tuple[int, list]:
+        response = await rpc_call(lambda rpc: rpc_pool.get(rpc).get_multiple_accounts(chunk, data_slice=data_slice))
+        return response.context.slot, response.value
+
+    results = await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+    slot = min((chunk_slot for chunk_slot, _ in results), default=0)
+    return slot, [account for _, chunk in results for account in chunk]
+
+async def get_bonding_curves(mints: List[str]) -> Dict[str, Optional[BondingCurve]]:
+    """Bonding curves of many mints in one batched read, skipping those cached for the current slot"""
+    curves: Dict[str, Optional[BondingCurve]] = {}
+    missing = []
+    for mint in dict.fromkeys(mints):
+        entry = cached_bonding_curve(mint)
+        if entry is None:
+            missing.append(mint)
+        else:
+            curves[mint] = entry[1]
+    if missing:
+        slot, accounts = await get_multiple_accounts_at(
+            [derive_bonding_curve(Pubkey.from_string(mint)) for mint in missing],
+            data_slice=DataSliceOpts(offset=BONDING_CURVE_OFFSET, length=BONDING_CURVE_SIZE),
+        )
+        for mint, account in zip(missing, accounts):
+            curves[mint] = read_bonding_curve(account, offset=0)
+            cache_bonding_curve(mint, slot, curves[mint])
+    return curves
+
+async def get_bonding_curve(ca: str) -> Optional[BondingCurve]:
+    """One mint's bonding curve; None off-curve or when the read fails (valuation is optional)"""
     try:
-        mint = Pubkey.from_string(ca)
+        return (await inflight.do(("curve", ca), lambda: get_bonding_curves([ca])))[ca]
+    except Exception as e:
+        logger.warning(f"Bonding curve read for {ca} failed: {e}")
+        return None
+
+async def get_token_balances(pairs: List[tuple[str, str]]) -> List[TokenBalance]:
+    """Token and SOL balances for many (mint, wallet) pairs in one batched read.
+
+    The wallet, its ATA and the mint's pump.fun bonding curve are fetched
+    together, so a single pair costs one getMultipleAccounts call instead of
+    getBalance + getAccountInfo + a price lookup. Once a mint's decimals are
+    known the read is compact: one dataSlice (bytes 8..72) covers both the
+    curve fields and the token amount instead of whole accounts.
+    """
+    index: Dict[Pubkey, int] = {}
+    wanted = []
+    for ca, wallet_addr in pairs:
         wallet = Pubkey.from_string(wallet_addr)
-        
-        # Get SOL balance
-        sol_balance_response = client.get_balance(wallet)
-        sol_balance = sol_balance_response.value / 1_000_000_000 if sol_balance_response.value else 0
-        
-        # Find ATA (Associated Token Account)
-        ata = Pubkey.find_program_address(
-            [bytes(wallet), bytes(TOKEN_PROGRAM_ID), bytes(mint)],
-            ASSOCIATED_TOKEN_PROGRAM_ID
-        )[0]
-
-        # Get account data
-        account_info = client.get_account_info(ata)
-        if not account_info.value:
-            return 0, sol_balance
-
-        # Token balance is the first 8 bytes (u64, little-endian)
-        data = account_info.value.data
-        if len(data) < 64:
-            return 0, sol_balance
-            
-        token_balance = int.from_bytes(data[:8], "little")
-        return token_balance, sol_balance
-        
+        mint = Pubkey.from_string(ca)
+        ata = derive_ata(wallet, mint)
+        curve = derive_bonding_curve(mint)
+        for key in (wallet, ata, curve):
+            index.setdefault(key, len(index))
+        wanted.append((wallet, mint, ata, curve))
+
+    compact = RPC_COMPACT_READS and all(mint_decimals.get(ca) is not None for ca, _ in pairs)
+    if compact:
+        slot, accounts = await get_multiple_accounts_at(
+            list(index),
+            data_slice=DataSliceOpts(offset=BONDING_CURVE_OFFSET, length=TOKEN_AMOUNT_OFFSET + 8 - BONDING_CURVE_OFFSET),
+        )
+    else:
+        for _, mint, _, _ in wanted:
+            index.setdefault(mint, len(index))
+        slot, accounts = await get_multiple_accounts_at(list(index))
+        for _, mint, _, _ in wanted:
+            mint_account = accounts[index[mint]]
+            if mint_account and len(mint_account.data) >= MINT_ACCOUNT_SIZE:
+                mint_decimals.set(str(mint), decode_mint_account(mint_account.data).decimals)
+
+    balances = []
+    for wallet, mint, ata, curve in wanted:
+        wallet_account = accounts[index[wallet]]
+        sol_balance = wallet_account.lamports / 1_000_000_000 if wallet_account else 0
+
+        ata_account = accounts[index[ata]]
+        token_balance = 0
+        amount_offset = TOKEN_AMOUNT_OFFSET - BONDING_CURVE_OFFSET
+        if ata_account and compact and len(ata_account.data) >= amount_offset + 8:
+            token_balance = struct.unpack_from("<Q", ata_account.data, amount_offset)[0]
+        elif ata_account and len(ata_account.data) >= TOKEN_ACCOUNT_SIZE:
+            token_balance = decode_token_account(ata_account.data).amount
+
+        bonding_curve = read_bonding_curve(accounts[index[curve]], offset=0 if compact else BONDING_CURVE_OFFSET)
+        cache_bonding_curve(str(mint), slot, bonding_curve)
+        balances.append(TokenBalance(token_balance, mint_decimals.get(str(mint)) or 0, sol_balance, bonding_curve))
+    return balances
+
+# 💼 Portfolio across all bot wallets
+class Holding(NamedTuple):
+    mint: str
+    wallet: str
+    amount: int
+    decimals: int
+
+    @property
+    def ui_amount(self) -> float:
+        return self.amount / (10 ** self.decimals)
+
+async def get_portfolio(wallets: List[str]) -> tuple[Dict[str, float], List[Holding], List[str]]:
+    """SOL balance per wallet, every non-zero token holding and the wallets that failed.
+
+    SOL balances come from batched getMultipleAccounts (sliced to zero data
+    bytes); token holdings from one jsonParsed getTokenAccountsByOwner per
+    wallet, at most PORTFOLIO_CONCURRENCY in flight. Decimals seen here warm
+    the mint_decimals cache used by compact balance reads.
+    """
+    semaphore = asyncio.Semaphore(PORTFOLIO_CONCURRENCY)
+    opts = TokenAccountOpts(program_id=TOKEN_PROGRAM_ID)
+
+    async def token_accounts(wallet: str) -> list:
+        owner = Pubkey.from_string(wallet)
+        async with semaphore:
+            response = await rpc_call(lambda rpc: rpc_pool.get(rpc).get_token_accounts_by_owner_json_parsed(owner, opts))
+        return response.value
+
+    accounts, *per_wallet = await asyncio.gather(
+        get_multiple_accounts([Pubkey.from_string(w) for w in wallets], data_slice=DataSliceOpts(offset=0, length=0)),
+        *(token_accounts(w) for w in wallets),
+        return_exceptions=True,
+    )
+    if isinstance(accounts, Exception):
+        raise accounts
+    sol = {w: (a.lamports / 1_000_000_000 if a else 0.0) for w, a in zip(wallets, accounts)}
+
+    holdings = []
+    failed = []
+    for wallet, keyed_accounts in zip(wallets, per_wallet):
+        if isinstance(keyed_accounts, Exception):
+            logger.warning(f"Token accounts for {wallet} failed: {keyed_accounts}")
+            failed.append(wallet)
+            continue
+        for keyed in keyed_accounts:
+            info = keyed.account.data.parsed["info"]
+            token_amount = info["tokenAmount"]
+            mint_decimals.set(info["mint"], token_amount["decimals"])
+            amount = int(token_amount["amount"])
+            if amount:
+                holdings.append(Holding(info["mint"], wallet, amount, token_amount["decimals"]))
+    return sol, holdings, failed
+
+# 👥 On-chain holder concentration
+def gini(amounts) -> Optional[float]:
+    """Gini coefficient of holder balances (0 = equal, 1 = one holder owns everything)"""
+    values = sorted(a for a in amounts if a > 0)
+    n = len(values)
+    total = sum(values)
+    if n == 0 or total == 0:
+        return None
+    weighted = sum((i + 1) * v for i, v in enumerate(values))
+    return (2 * weighted) / (n * total) - (n + 1) / n
+
+# Matches the address and base64 8-byte amount of one account in a dataSlice'd
+# getProgramAccounts response (RPC nodes write "pubkey" before "account")
+_SLICED_ACCOUNT_RE = re.compile(
+    rb'"pubkey":\s*"([1-9A-HJ-NP-Za-km-z]{32,44})"\s*,\s*"account":\s*\{[^{}]*?'
+    rb'"data":\s*\[\s*"([A-Za-z0-9+/]{11}=)"\s*,\s*"base64"\s*\]'
+)
+
+async def scan_holder_amounts(ca: str) -> tuple[array, bool]:
+    """Stream every token account balance of a mint via getProgramAccounts.
+
+    Filters on dataSize and a memcmp of the mint at offset 0 and slices out
+    only the 8-byte amount. The response is parsed chunk by chunk into a
+    compact array; reading stops at HOLDER_SCAN_MAX_ACCOUNTS or
+    HOLDER_SCAN_MAX_BYTES, in which case the result is marked incomplete.
+    The bonding curve's own token account is left out by address. Runs
+    through rpc_call (breakers, failover, metrics) but is never hedged.
+    """
+    mint = Pubkey.from_string(ca)
+    curve_account = str(derive_ata(derive_bonding_curve(mint), mint)).encode()
+    payload = {
+        "jsonrpc": "2.0", "id": 1, "method": "getProgramAccounts",
+        "params": [str(TOKEN_PROGRAM_ID), {
+            "encoding": "base64",
+            "commitment": RPC_COMMITMENT,
+            "dataSlice": {"offset": TOKEN_AMOUNT_OFFSET, "length": 8},
+            "filters": [
+                {"dataSize": TOKEN_ACCOUNT_SIZE},
+                {"memcmp": {"offset": 0, "bytes": ca}},
+            ],
+        }],
+    }
+    return await rpc_call(lambda rpc: _stream_holder_amounts(rpc, payload, curve_account), hedge=False)
+
+async def _stream_holder_amounts(rpc: str, payload: Dict[str, Any], exclude: bytes) -> tuple[array, bool]:
+    amounts = array("Q")
+    buffer = b""
+    read = 0
+    session = http_pool.get(rpc)
+    async with session.post(rpc, json=payload, timeout=aiohttp.ClientTimeout(total=HOLDER_SCAN_TIMEOUT)) as response:
+        response.raise_for_status()
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            read += len(chunk)
+            buffer += chunk
+            end = 0
+            for match in _SLICED_ACCOUNT_RE.finditer(buffer):
+                amount = struct.unpack("<Q", base64.b64decode(match.group(2)))[0]
+                if amount and match.group(1) != exclude:
+                    amounts.append(amount)
+                end = match.end()
+            buffer = buffer[end:] if end else buffer[-512:]
+            if len(amounts) >= HOLDER_SCAN_MAX_ACCOUNTS or read >= HOLDER_SCAN_MAX_BYTES:
+                return amounts, False
+        if not amounts and b'"error"' in buffer:
+            raise RuntimeError(f"getProgramAccounts failed: {buffer[:200].decode(errors='replace')}")
+    return amounts, True
+
+async def fetch_top_holders(ca: str) -> tuple[List[int], int, int]:
+    """Largest balances (bonding curve excluded), total supply and the curve's balance"""
+    mint = Pubkey.from_string(ca)
+    curve_account = derive_ata(derive_bonding_curve(mint), mint)
+    largest, supply = await asyncio.gather(
+        rpc_call(lambda rpc: rpc_pool.get(rpc).get_token_largest_accounts(mint)),
+        rpc_call(lambda rpc: rpc_pool.get(rpc).get_token_supply(mint)),
+    )
+    curve_amount = 0
+    holders = []
+    for account in largest.value:
+        amount = int(account.amount.amount)
+        if account.address == curve_account:
+            curve_amount = amount
+        else:
+            holders.append(amount)
+    return holders, int(supply.value.amount), curve_amount
+
+holder_stats = TTLCache(max_size=RUG_CACHE_MAX_SIZE, ttl=HOLDER_SCAN_TTL * 2)
+
+def get_holder_concentration(ca: str) -> Dict[str, Any]:
+    """Cached top-10 share and Gini of a mint's holders; stale figures are refreshed in the background.
+
+    A rug check never waits on these RPCs and is scored with whatever is
+    cached (None until the first read lands). The top-10 read
+    (getTokenLargestAccounts + getTokenSupply) is refreshed every
+    HOLDER_TOP10_TTL seconds, at most HOLDER_TOP10_CONCURRENCY at a time;
+    the full holder scan behind the Gini figure every HOLDER_SCAN_TTL
+    seconds, at most HOLDER_SCAN_CONCURRENCY at a time. With every slot
+    busy a refresh is skipped, not queued; the next check retries. Results
+    are written into the cached dict in place.
+    """
+    stats = holder_stats.get(ca)
+    if stats is None:
+        stats = {"top10_share": None, "gini": None, "holders_scanned": 0, "scan_complete": False,
+                 "curve_amount": 0, "top10_at": float("-inf"), "scan_at": float("-inf")}
+        holder_stats.set(ca, stats)
+    now = time.monotonic()
+    if (now - stats["top10_at"] >= HOLDER_TOP10_TTL
+            and background.pending("top_holders") < HOLDER_TOP10_CONCURRENCY):
+        background.spawn(("top_holders", ca), lambda: refresh_top_holders(ca))
+    if (now - stats["scan_at"] >= HOLDER_SCAN_TTL
+            and background.pending("holder_scan") < HOLDER_SCAN_CONCURRENCY
+            and background.spawn(("holder_scan", ca), lambda: refresh_holder_scan(ca))):
+        stats["scan_at"] = now
+    return stats
+
+async def refresh_top_holders(ca: str) -> None:
+    """Background top-10 read; a failure leaves the figure stale and is retried on the next check"""
+    try:
+        holders, supply, curve_amount = await fetch_top_holders(ca)
+        stats = holder_stats.get(ca)
+        if stats is not None:
+            circulating = supply - curve_amount
+            stats.update(
+                top10_share=sum(sorted(holders, reverse=True)[:10]) / circulating if circulating > 0 else None,
+                curve_amount=curve_amount,
+                top10_at=time.monotonic(),
+            )
     except Exception as e:
-        logger.error(f"Balance check error: {e}")
-        return 0, 0.0
+        logger.warning(f"Top holder lookup failed for {ca}: {e}")
+
+async def refresh_holder_scan(ca: str) -> None:
+    """Background full holder scan feeding the Gini figure"""
+    try:
+        amounts, complete = await inflight.do(("holder_scan", ca), lambda: scan_holder_amounts(ca))
+        stats = holder_stats.get(ca)
+        if stats is not None:
+            stats.update(gini=gini(amounts), holders_scanned=len(amounts), scan_complete=complete)
+    except Exception as e:
+        logger.warning(f"Holder scan failed for {ca}: {e}")
+
+# 🧮 Vectorized risk scoring
+RISK_FACTOR_LABELS = ("LP not locked", "Owner has admin rights", "Low volume", "Few holders", "Low market cap", "Top 10 holders own {share:.0%}")
+RISK_WEIGHTS = np.array([
+    RISK_WEIGHT_LP_UNLOCKED, RISK_WEIGHT_OWNER_ADMIN, RISK_WEIGHT_LOW_VOLUME,
+    RISK_WEIGHT_FEW_HOLDERS, RISK_WEIGHT_LOW_MARKET_CAP, RISK_WEIGHT_CONCENTRATED,
+])
+RISK_MAX_SCORE = float(RISK_WEIGHTS.sum())
+
+def score_risk_batch(records: List[Dict[str, Any]], top10_shares: Optional[List[Optional[float]]] = None) -> List[Dict[str, Any]]:
+    """Score many pump.fun coin documents at once.
+
+    Metrics are gathered into arrays, every factor is evaluated as one
+    vector comparison and the weighted score is a single matrix product.
+    Missing top-10 shares (None) never count as concentrated.
+    """
+    n = len(records)
+    if n == 0:
+        return []
+    shares = np.array([np.nan if s is None else s for s in (top10_shares or [None] * n)], dtype=float)
+    market_cap = np.array([r.get("marketCap") or 0 for r in records], dtype=float)
+    volume = np.array([r.get("recentVolume") or 0 for r in records], dtype=float)
+    holder_count = np.array([r.get("holderCount") or 0 for r in records], dtype=float)
+    lp_locked = np.array([bool(r.get("lpLocked", False)) for r in records])
+    owner_admin = np.array([bool(r.get("ownerHasAdmin", False)) for r in records])
+
+    flags = np.column_stack([
+        ~lp_locked,
+        owner_admin,
+        volume < RISK_MIN_VOLUME,
+        holder_count < RISK_MIN_HOLDERS,
+        market_cap < RISK_MIN_MARKET_CAP,
+        np.nan_to_num(shares, nan=0.0) > HOLDER_TOP10_MAX_SHARE,
+    ])
+    scores = flags @ RISK_WEIGHTS
+
+    results = []
+    for i, record in enumerate(records):
+        factors = [RISK_FACTOR_LABELS[j].format(share=shares[i]) for j in np.flatnonzero(flags[i])]
+        score = float(scores[i])
+        results.append({
+            "risk": score >= RISK_HIGH_SCORE,
+            "risk_score": score,
+            "factors": factors,
+            "data": record,
+        })
+    return results
+
+def risk_band(risk_score: float) -> tuple[str, str, str]:
+    """(emoji, label, color) for a risk score"""
+    if risk_score <= RISK_LOW_MAX:
+        return "✅", "LOW RISK", "🟢"
+    if risk_score <= RISK_MEDIUM_MAX:
+        return "⚠️", "MEDIUM RISK", "🟡"
+    return "🚨", "HIGH RISK", "🔴"
 
 # 🚨 Enhanced rug detection
 async def check_rug_risk(ca: str) -> Dict[str, Any]:
-    """Enhanced rug pull detection with more metrics"""
+    """Rug check shared by all commands, served from cache when fresh.
+
+    Successful lookups are kept for RUG_CACHE_TTL seconds; failed lookups
+    only for RUG_CACHE_NEGATIVE_TTL so an outage is retried soon without
+    every command hitting the API in the meantime.
+    """
+    cached = rug_cache.get(ca)
+    if cached is not None:
+        return cached
+
+    result = await inflight.do(("rug", ca), lambda: fetch_rug_risk(ca))
+    cache_rug_result(ca, result)
+    return result
+
+async def check_rug_risk_many(cas: List[str], concurrency: int = RUGCHECK_CONCURRENCY,
+                              max_age: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Rug check for many mints: cached results are reused, the rest fetched
+    concurrently (at most `concurrency` at a time) and scored in one batch.
+
+    With max_age set, cached rug results are skipped and pump.fun data may
+    be at most max_age seconds old (0 always asks the API).
+    """
+    results = {ca: None if max_age is not None else rug_cache.get(ca) for ca in cas}
+    missing = [ca for ca, result in results.items() if result is None]
+    if missing:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(ca: str):
+            async with semaphore:
+                return await fetch_rug_inputs(ca, max_age)
+
+        fetched = await asyncio.gather(*(fetch(ca) for ca in missing))
+        for ca, result in zip(missing, build_rug_results(fetched)):
+            cache_rug_result(ca, result)
+            results[ca] = result
+    return [results[ca] for ca in cas]
+
+def cache_rug_result(ca: str, result: Dict[str, Any]) -> None:
+    ttl = RUG_CACHE_TTL if "data" in result else RUG_CACHE_NEGATIVE_TTL
+    rug_cache.set(ca, result, ttl=ttl)
+
+async def fetch_rug_risk(ca: str) -> Dict[str, Any]:
+    """pump.fun metrics and on-chain holder concentration, fetched concurrently"""
+    return build_rug_results([await fetch_rug_inputs(ca)])[0]
+
+async def fetch_rug_inputs(ca: str, max_age: Optional[float] = None) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    """pump.fun document plus a snapshot of the cached holder figures (refreshes start first, never awaited)"""
+    holders = get_holder_concentration(ca)
+    coin = await inflight.do(("coin", ca, max_age), lambda: fetch_coin_data(ca, max_age))
+    return coin, dict(holders)
+
+def build_rug_results(fetched: List[tuple[Dict[str, Any], Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Score every successful fetch in one batch; failures pass through as-is"""
+    scored_at = [i for i, (coin, _) in enumerate(fetched) if "data" in coin]
+    scored = score_risk_batch(
+        [fetched[i][0]["data"] for i in scored_at],
+        [fetched[i][1].get("top10_share") for i in scored_at],
+    )
+    results = [dict(coin) for coin, _ in fetched]
+    for i, result in zip(scored_at, scored):
+        result["fetched_at"] = fetched[i][0]["fetched_at"]
+        results[i] = result
+    for result, (_, holders) in zip(results, fetched):
+        result["holders"] = holders
+    return results
+
+async def fetch_coin_data(ca: str, max_age: Optional[float] = None) -> Dict[str, Any]:
+    """pump.fun coin document as {"data": ..., "fetched_at": ...}, or {"risk": True, "reason": ...} on failure.
+
+    Served from the disk cache while younger than COIN_CACHE_MAX_AGE; copies
+    older than COIN_CACHE_FRESH are returned as-is and refreshed in the
+    background (stale-while-revalidate). Callers that act on the data
+    (auto-sell) pass max_age to refuse older copies; 0 always asks the API.
+    """
+    cached = coin_cache.get(ca)
+    if cached is not None and (max_age is None or time.time() - cached[1] <= max_age):
+        data, fetched_at = cached
+        if time.time() - fetched_at > COIN_CACHE_FRESH:
+            metrics.inc("coin_cache", result="stale")
+            background.spawn(("revalidate", ca), lambda: revalidate_coin_data(ca))
+        else:
+            metrics.inc("coin_cache", result="fresh")
+        return {"data": data, "fetched_at": fetched_at}
+    metrics.inc("coin_cache", result="miss")
+    return await inflight.do(("coin_live", ca), lambda: fetch_coin_data_live(ca))
+
+async def revalidate_coin_data(ca: str) -> None:
+    """Background refresh of a stale cached coin; drops the rug result built on the old copy"""
+    result = await inflight.do(("coin_live", ca), lambda: fetch_coin_data_live(ca))
+    if "data" in result:
+        rug_cache.invalidate(ca)
+
+async def fetch_coin_data_live(ca: str) -> Dict[str, Any]:
+    """pump.fun coin document straight from the API, stored in the disk cache on success"""
+    breaker = get_breaker("pump.fun")
+    if not breaker.allow():
+        return {"risk": True, "reason": "API unavailable (circuit open)"}
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            async with session.get(f"https://api.pump.fun/coins/{ca}") as response:
+        with metrics.timer("quota_wait", upstream="pump.fun"):
+            await get_upstream_limiter("pump.fun").acquire()
+        url = f"{PUMP_API_URL}/coins/{ca}"
+        session = http_pool.get(url)
+        with metrics.timer("upstream", upstream="pump.fun") as sample:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
                 if response.status != 200:
+                    sample["outcome"] = "error"
+                    if response.status >= 500 or response.status == 429:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
                     return {"risk": True, "reason": "API unavailable"}
-                
+
                 data = await response.json()
-                
-                # Multiple risk factors
-                lp_locked = data.get("lpLocked", False)
-                owner_has_admin = data.get("ownerHasAdmin", False)
-                recent_volume = data.get("recentVolume", 0)
-                holder_count = data.get("holderCount", 0)
-                market_cap = data.get("marketCap", 0)
-                
-                risk_factors = []
-                
-                if not lp_locked:
-                    risk_factors.append("LP not locked")
-                if owner_has_admin:
-                    risk_factors.append("Owner has admin rights")
-                if recent_volume < 1000:
-                    risk_factors.append("Low volume")
-                if holder_count < 50:
-                    risk_factors.append("Few holders")
-                if market_cap < 10000:
-                    risk_factors.append("Low market cap")
-                    
-                return {
-                    "risk": len(risk_factors) >= 3,
-                    "risk_score": len(risk_factors),
-                    "factors": risk_factors,
-                    "data": data
-                }
-                
+        breaker.record_success()
+        fetched_at = time.time()
+        coin_cache.put(ca, data, fetched_at)
+        background.spawn(("coin_cache_flush",), lambda: asyncio.to_thread(coin_cache.flush))
+        return {"data": data, "fetched_at": fetched_at}
+
+    except asyncio.CancelledError:
+        breaker.release()
+        raise
     except Exception as e:
+        breaker.record_failure()
         logger.error(f"Rug check error: {e}")
         return {"risk": True, "reason": f"Check failed: {str(e)}"}
 
+def format_curve(curve: BondingCurve) -> str:
+    """Report lines for a mint's on-chain bonding curve"""
+    if curve.complete:
+        return "**⛓️ BONDING CURVE:** 🎓 Completed, trading moved off the curve\n"
+    return (
+        "**⛓️ BONDING CURVE (on-chain):**\n"
+        f"💲 **Price:** {format_price(curve.price_sol)} SOL\n"
+        f"🏦 **Market Cap:** {format_number(curve.market_cap_sol, 2)} SOL\n"
+        f"💧 **Liquidity:** {format_number(curve.liquidity_sol, 2)} SOL\n"
+        f"📈 **Progress:** {curve.progress:.1%}\n"
+    )
+
 # 🎯 Enhanced command handlers with better UX
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Enhanced start command with interactive buttons"""
@@ -686,7 +2616,7 @@ async def callback_query_handler(update: Update, context: ContextTypes.DEFAULT_T
 📚 `/help <command>` - Detailed help
 💡 `/examples` - Practical examples
 ⚙️ `/settings` - Bot configuration
-📊 `/stats` - Your trading stats
+📈 `/stats` - Bot latency and cache stats (admin only)
 
 **💡 Tip:** Use `/help pump` for detailed pump command help!
 """
@@ -708,7 +2638,7 @@ async def callback_query_handler(update: Update, context: ContextTypes.DEFAULT_T
 • Auto failover: ✅ Enabled
 
 **💾 Data:**
-• Wallet storage: JSON file
+• Wallet storage: SQLite (WAL)
 • Logging: ✅ Enabled
 
 **💡 To modify settings:**
@@ -726,7 +2656,7 @@ Edit your `.env` file and restart the bot.
 • Real-time error feedback
 
 **⚡ Rate Limiting:**
-• 5 second cooldown between commands
+• Per-user token bucket, trades cost more than lookups
 • Prevents spam and abuse
 • User-specific limits
 
@@ -760,18 +2690,12 @@ async def balance(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Enhanced balance command with better formatting"""
     user_id = update.effective_user.id
     
-    if not check_admin_access(user_id) or not check_rate_limit(user_id):
+    if not check_admin_access(user_id) or not check_rate_limit(user_id, "balance"):
         await update.message.reply_text("❌ Access denied or rate limited.")
         return
         
     if not context.args:
-        await update.message.reply_text(
-            "❌ **Missing Parameter**\n\n"
-            "**Usage:** `/balance <CONTRACT_ADDRESS>`\n\n"
-            "**Example:** `/balance So11111111111111111111111111111111111111112`\n\n"
-            "💡 Use `/help balance` for detailed explanation",
-            parse_mode='Markdown'
-        )
+        await portfolio(update)
         return
         
     ca = context.args[0]
@@ -783,8 +2707,8 @@ async def balance(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     try:
-        wallet = get_or_create_wallet_for_token(ca)
-        token_balance, sol_balance = await get_token_balance(ca, wallet["address"])
+        wallet = await wallet_for_token(ca)
+        position = await get_token_position(ca, wallet["address"])
         
         # Create detailed balance report
         report = f"""
@@ -794,9 +2718,14 @@ async def balance(update: Update, context: ContextTypes.DEFAULT_TYPE):
 **👛 Wallet:** `{shorten_address(wallet['address'])}`
 
 **💰 BALANCES:**
-🪙 **Tokens:** {format_number(token_balance, 0)} tokens
-💎 **SOL:** {format_number(sol_balance)} SOL
-
+🪙 **Tokens:** {format_number(position.ui_amount, 2)} tokens
+💎 **SOL:** {format_number(position.sol)} SOL
+"""
+        if position.value_sol is not None:
+            report += f"💵 **Value:** {format_number(position.value_sol)} SOL (sell on the curve, before fees)\n"
+        if position.curve is not None:
+            report += "\n" + format_curve(position.curve)
+        report += f"""
 **📅 Wallet Created:** {wallet.get('created_at', 'Unknown')[:10]}
 
 💡 **Need help?** Use `/help dump` to learn how to sell tokens
@@ -812,11 +2741,73 @@ async def balance(update: Update, context: ContextTypes.DEFAULT_TYPE):
             f"💡 Try again in a few seconds or use `/help balance`"
         )
 
+async def portfolio(update: Update):
+    """Overview of every bot wallet: SOL and all token holdings"""
+    wallets = [w["address"] for w in load_wallets()]
+    if not wallets:
+        await update.message.reply_text(
+            "📊 **PORTFOLIO**\n\nNo wallets yet — they are created on your first `/pump`.\n\n"
+            "💡 Use `/balance <CA>` to check a single token",
+            parse_mode='Markdown'
+        )
+        return
+
+    msg = await message_updater.reply(update.message, f"⏳ **Loading {len(wallets)} wallets...**", parse_mode='Markdown')
+    try:
+        sol, holdings, failed = await get_portfolio(wallets)
+    except Exception as e:
+        logger.error(f"Portfolio error: {e}")
+        await message_updater.edit(
+            msg,
+            f"❌ **Error loading portfolio**\n\n"
+            f"Details: {str(e)}\n\n"
+            f"💡 Try again in a few seconds or use `/balance <CA>`"
+        )
+        return
+
+    # Valued on the bonding curves: one batched on-chain read, no pump.fun call
+    try:
+        curves = await get_bonding_curves([h.mint for h in holdings])
+    except Exception as e:
+        logger.warning(f"Portfolio valuation failed: {e}")
+        curves = {}
+    values = {}
+    for holding in holdings:
+        curve = curves.get(holding.mint)
+        if curve is not None and not curve.complete:
+            values[holding] = curve.sell_quote_sol(holding.amount)
+
+    report = f"""
+📊 **PORTFOLIO**
+
+**👛 Wallets:** {len(wallets)}
+💎 **Total SOL:** {format_number(sum(sol.values()))} SOL
+🪙 **Token Positions:** {len(holdings)}
+"""
+    if values:
+        report += f"💵 **Token Value:** {format_number(sum(values.values()))} SOL ({len(values)} on a bonding curve)\n"
+    report += "\n"
+    if holdings:
+        report += "**💰 HOLDINGS:**\n"
+        for holding in sorted(holdings, key=lambda h: h.ui_amount, reverse=True)[:PORTFOLIO_MAX_LINES]:
+            value = f" ≈ {format_number(values[holding])} SOL" if holding in values else ""
+            report += (f"• `{shorten_address(holding.mint)}` — {format_number(holding.ui_amount, 2)} tokens{value} "
+                       f"(👛 `{shorten_address(holding.wallet)}`, {format_number(sol[holding.wallet])} SOL)\n")
+        if len(holdings) > PORTFOLIO_MAX_LINES:
+            report += f"… and {len(holdings) - PORTFOLIO_MAX_LINES} more\n"
+    else:
+        report += "**💰 HOLDINGS:** none\n"
+    if failed:
+        report += f"\n⚠️ Could not read token accounts for {len(failed)} wallet(s)\n"
+    report += "\n💡 Use `/balance <CA>` for details on one token"
+
+    await message_updater.edit(msg, report, parse_mode='Markdown')
+
 async def pump(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Enhanced pump command with detailed validation and feedback"""
     user_id = update.effective_user.id
     
-    if not check_admin_access(user_id) or not check_rate_limit(user_id):
+    if not check_admin_access(user_id) or not check_rate_limit(user_id, "pump"):
         await update.message.reply_text("❌ Access denied or rate limited.")
         return
         
@@ -858,21 +2849,20 @@ async def pump(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     # Create progress message
-    msg = await update.message.reply_text("⏳ **Processing Buy Order...**\n\n🔍 Validating parameters...", parse_mode='Markdown')
+    msg = await message_updater.reply(update.message, "⏳ **Processing Buy Order...**\n\n🔍 Validating parameters...", parse_mode='Markdown')
     
     try:
         # Step 1: Rug check
-        await msg.edit_text("⏳ **Processing Buy Order...**\n\n🛡️ Checking rug pull risks...", parse_mode='Markdown')
+        message_updater.progress(msg, "⏳ **Processing Buy Order...**\n\n🛡️ Checking rug pull risks...", parse_mode='Markdown')
         
-        async with throttler:
-            rug_check = await check_rug_risk(ca)
+        rug_check = await check_rug_risk(ca)
             
         if rug_check["risk"] and "force" not in context.args:
             risk_report = f"""
 ⚠️ **HIGH RUG RISK DETECTED!**
 
 **🎯 Token:** `{shorten_address(ca)}`
-**📊 Risk Score:** {rug_check.get('risk_score', 0)}/5
+**📊 Risk Score:** {rug_check.get('risk_score', 0):g}/{RISK_MAX_SCORE:g}
 
 **🚨 Risk Factors:**
 """
@@ -885,17 +2875,17 @@ async def pump(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 **🛡️ Recommendation:** Use `/rugcheck {ca}` for detailed analysis
 """
-            await msg.edit_text(risk_report, parse_mode='Markdown')
+            await message_updater.edit(msg, risk_report, parse_mode='Markdown')
             return
         
         # Step 2: Create wallet and execute
-        await msg.edit_text("⏳ **Processing Buy Order...**\n\n👛 Preparing wallet...", parse_mode='Markdown')
+        message_updater.progress(msg, "⏳ **Processing Buy Order...**\n\n👛 Preparing wallet...", parse_mode='Markdown')
         await human_delay()
         
         actual_amount = get_random_amount(sol_amount)
-        wallet = get_or_create_wallet_for_token(ca)
+        wallet = await wallet_for_token(ca)
         
-        await msg.edit_text("⏳ **Processing Buy Order...**\n\n🚀 Executing transaction...", parse_mode='Markdown')
+        message_updater.progress(msg, "⏳ **Processing Buy Order...**\n\n🚀 Executing transaction...", parse_mode='Markdown')
         
         tx_link = await execute_buy(ca, actual_amount, wallet["private_key"])
         
@@ -920,7 +2910,7 @@ async def pump(update: Update, context: ContextTypes.DEFAULT_TYPE):
 🎉 **Happy trading!**
 """
         
-        await msg.edit_text(success_report, parse_mode='Markdown')
+        await message_updater.edit(msg, success_report, parse_mode='Markdown')
         
     except Exception as e:
         logger.error(f"Pump command error: {e}")
@@ -941,13 +2931,13 @@ async def pump(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 **🆘 Still having issues?** The RPC might be busy, try again in a few seconds.
 """
-        await msg.edit_text(error_report, parse_mode='Markdown')
+        await message_updater.edit(msg, error_report, parse_mode='Markdown')
 
 async def dump(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Enhanced dump command with detailed validation and calculation display"""
     user_id = update.effective_user.id
     
-    if not check_admin_access(user_id) or not check_rate_limit(user_id):
+    if not check_admin_access(user_id) or not check_rate_limit(user_id, "dump"):
         await update.message.reply_text("❌ Access denied or rate limited.")
         return
         
@@ -989,13 +2979,14 @@ async def dump(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(f"{percent_message}\n\n💡 Use `/help dump` for examples")
         return
     
-    msg = await update.message.reply_text("⏳ **Processing Sell Order...**\n\n👛 Checking wallet balance...", parse_mode='Markdown')
+    msg = await message_updater.reply(update.message, "⏳ **Processing Sell Order...**\n\n👛 Checking wallet balance...", parse_mode='Markdown')
     
     try:
-        wallet = get_or_create_wallet_for_token(ca)
+        wallet = await wallet_for_token(ca)
         
         # Get current balance
-        token_balance, sol_balance = await get_token_balance(ca, wallet["address"])
+        position = await get_token_position(ca, wallet["address"])
+        token_balance = position.amount
         
         if token_balance <= 0:
             no_tokens_msg = f"""
@@ -1011,16 +3002,17 @@ async def dump(update: Update, context: ContextTypes.DEFAULT_TYPE):
 • Use `/balance {ca}` to verify
 • Make sure you're using the correct contract address
 """
-            await msg.edit_text(no_tokens_msg, parse_mode='Markdown')
+            await message_updater.edit(msg, no_tokens_msg, parse_mode='Markdown')
             return
         
         # Calculate sell amount
         token_amount_to_sell = int(token_balance * (percent / 100))
         
         if token_amount_to_sell <= 0:
-            await msg.edit_text(
+            await message_updater.edit(
+                msg,
                 f"❌ **Calculated sell amount is 0**\n\n"
-                f"Your balance ({format_number(token_balance, 0)} tokens) × {percent}% = 0\n\n"
+                f"Your balance ({format_number(position.ui_amount, 2)} tokens) × {percent}% = 0\n\n"
                 f"💡 Try a higher percentage or check your balance"
             )
             return
@@ -1030,15 +3022,15 @@ async def dump(update: Update, context: ContextTypes.DEFAULT_TYPE):
 ⏳ **Processing Sell Order...**
 
 **📊 CALCULATION:**
-🪙 **Current Balance:** {format_number(token_balance, 0)} tokens
+🪙 **Current Balance:** {format_number(position.ui_amount, 2)} tokens
 📊 **Sell Percentage:** {percent}%
-💸 **Tokens to Sell:** {format_number(token_amount_to_sell, 0)} tokens
-💰 **Remaining:** {format_number(token_balance - token_amount_to_sell, 0)} tokens
+💸 **Tokens to Sell:** {format_number(position.to_ui(token_amount_to_sell), 2)} tokens
+💰 **Remaining:** {format_number(position.to_ui(token_balance - token_amount_to_sell), 2)} tokens
 
 🚀 **Executing transaction...**
 """
         
-        await msg.edit_text(calculation_msg, parse_mode='Markdown')
+        await message_updater.edit(msg, calculation_msg, parse_mode='Markdown')
         await human_delay()
         
         tx_link = await execute_sell(ca, token_amount_to_sell, wallet["private_key"])
@@ -1049,8 +3041,8 @@ async def dump(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 **📊 TRADE DETAILS:**
 🪙 **Token:** `{shorten_address(ca)}`
-📊 **Sold:** {percent}% ({format_number(token_amount_to_sell, 0)} tokens)
-💰 **Remaining:** {format_number(token_balance - token_amount_to_sell, 0)} tokens
+📊 **Sold:** {percent}% ({format_number(position.to_ui(token_amount_to_sell), 2)} tokens)
+💰 **Remaining:** {format_number(position.to_ui(token_balance - token_amount_to_sell), 2)} tokens
 👛 **Wallet:** `{shorten_address(wallet['address'])}`
 
 **🔗 TRANSACTION:**
@@ -1063,7 +3055,7 @@ async def dump(update: Update, context: ContextTypes.DEFAULT_TYPE):
 🎉 **Sale completed successfully!**
 """
         
-        await msg.edit_text(success_report, parse_mode='Markdown')
+        await message_updater.edit(msg, success_report, parse_mode='Markdown')
         
     except Exception as e:
         logger.error(f"Dump command error: {e}")
@@ -1084,13 +3076,13 @@ async def dump(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 **🆘 Still having issues?** The network might be busy, try again shortly.
 """
-        await msg.edit_text(error_report, parse_mode='Markdown')
+        await message_updater.edit(msg, error_report, parse_mode='Markdown')
 
 async def rugcheck(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Enhanced rug check with detailed risk analysis"""
     user_id = update.effective_user.id
     
-    if not check_admin_access(user_id) or not check_rate_limit(user_id):
+    if not check_admin_access(user_id) or not check_rate_limit(user_id, "rugcheck"):
         await update.message.reply_text("❌ Access denied or rate limited.")
         return
         
@@ -1104,33 +3096,30 @@ async def rugcheck(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
     
-    ca = context.args[0]
+    cas = list(dict.fromkeys(context.args))
+    if len(cas) > RUGCHECK_MAX_MINTS:
+        await update.message.reply_text(f"❌ At most {RUGCHECK_MAX_MINTS} contract addresses per check.")
+        return
+    for ca in cas:
+        is_valid, message = validate_ca_address(ca)
+        if not is_valid:
+            await update.message.reply_text(f"{message}\n\n💡 Use `/help rugcheck` for examples")
+            return
     
-    is_valid, message = validate_ca_address(ca)
-    if not is_valid:
-        await update.message.reply_text(f"{message}\n\n💡 Use `/help rugcheck` for examples")
+    if len(cas) > 1:
+        await rugcheck_many(update, cas)
         return
+    ca = cas[0]
     
-    msg = await update.message.reply_text("⏳ **Analyzing Token Security...**\n\n🔍 Gathering data from multiple sources...", parse_mode='Markdown')
+    msg = await message_updater.reply(update.message, "⏳ **Analyzing Token Security...**\n\n🔍 Gathering data from multiple sources...", parse_mode='Markdown')
     
     try:
-        async with throttler:
-            result = await check_rug_risk(ca)
+        # The curve is read on-chain, so it is current even when pump.fun data is cached or down
+        result, curve = await asyncio.gather(check_rug_risk(ca), get_bonding_curve(ca))
         
         # Determine risk level and emoji
         risk_score = result.get('risk_score', 0)
-        if risk_score <= 1:
-            risk_emoji = "✅"
-            risk_text = "LOW RISK"
-            risk_color = "🟢"
-        elif risk_score <= 3:
-            risk_emoji = "⚠️"
-            risk_text = "MEDIUM RISK"  
-            risk_color = "🟡"
-        else:
-            risk_emoji = "🚨"
-            risk_text = "HIGH RISK"
-            risk_color = "🔴"
+        risk_emoji, risk_text, risk_color = risk_band(risk_score)
         
         # Build comprehensive report
         report = f"""
@@ -1138,7 +3127,7 @@ async def rugcheck(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 **🎯 TOKEN ANALYSIS:**
 🏷️ **Contract:** `{shorten_address(ca)}`
-📊 **Risk Score:** {risk_score}/5 {risk_color}
+📊 **Risk Score:** {risk_score:g}/{RISK_MAX_SCORE:g} {risk_color}
 
 """
         
@@ -1157,19 +3146,33 @@ async def rugcheck(update: Update, context: ContextTypes.DEFAULT_TYPE):
             report += f"📊 **Volume (24h):** ${format_number(data.get('recentVolume', 0), 0)}\n"
             report += f"👥 **Holders:** {format_number(data.get('holderCount', 0), 0)}\n"
             report += f"🔒 **LP Locked:** {'✅ Yes' if data.get('lpLocked') else '❌ No'}\n"
-            report += f"👑 **Owner Admin:** {'⚠️ Yes' if data.get('ownerHasAdmin') else '✅ No'}\n\n"
+            report += f"👑 **Owner Admin:** {'⚠️ Yes' if data.get('ownerHasAdmin') else '✅ No'}\n"
+            holders = result.get('holders') or {}
+            if holders.get('top10_share') is not None:
+                report += f"🐋 **Top 10 Holders:** {holders['top10_share']:.1%}\n"
+            if holders.get('gini') is not None:
+                scanned = format_number(holders['holders_scanned'], 0)
+                partial = "" if holders.get('scan_complete') else ", partial"
+                report += f"📐 **Concentration (Gini):** {holders['gini']:.2f} ({scanned} holders{partial})\n"
+            if result.get('fetched_at'):
+                report += f"🕒 **Data Age:** {format_age(time.time() - result['fetched_at'])}\n"
+            report += "\n"
+        elif result.get('reason'):
+            report += f"**❓ pump.fun data unavailable:** {result['reason']}\n\n"
+        if curve is not None:
+            report += format_curve(curve) + "\n"
         
         # Add recommendations
-        if risk_score <= 1:
+        if risk_score <= RISK_LOW_MAX:
             report += "**💡 RECOMMENDATION:** This token appears relatively safe, but always invest responsibly."
-        elif risk_score <= 3:
+        elif risk_score <= RISK_MEDIUM_MAX:
             report += "**⚠️ RECOMMENDATION:** Proceed with caution. Consider small amounts only."
         else:
             report += "**🚨 RECOMMENDATION:** High risk detected! Avoid or use extreme caution."
         
         report += f"\n\n**🛡️ Want protection?** Use `/auto {ca}` for automatic rug detection"
         
-        await msg.edit_text(report, parse_mode='Markdown')
+        await message_updater.edit(msg, report, parse_mode='Markdown')
         
     except Exception as e:
         logger.error(f"Rugcheck command error: {e}")
@@ -1188,13 +3191,52 @@ async def rugcheck(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 **🔄 Try again in a few seconds or check the contract address.**
 """
-        await msg.edit_text(error_report, parse_mode='Markdown')
+        await message_updater.edit(msg, error_report, parse_mode='Markdown')
+
+async def rugcheck_many(update: Update, cas: List[str]):
+    """Ranked risk table for several contract addresses"""
+    msg = await message_updater.reply(update.message, f"⏳ **Analyzing {len(cas)} Tokens...**", parse_mode='Markdown')
+    try:
+        results, curves = await asyncio.gather(check_rug_risk_many(cas), get_bonding_curves(cas), return_exceptions=True)
+        if isinstance(results, Exception):
+            raise results
+        if isinstance(curves, Exception):
+            logger.warning(f"Bonding curve reads failed: {curves}")
+            curves = {}
+    except Exception as e:
+        logger.error(f"Rugcheck command error: {e}")
+        await message_updater.edit(msg, f"❌ **ANALYSIS FAILED**\n\n{str(e)}", parse_mode='Markdown')
+        return
+
+    # Riskiest first; failed lookups last
+    ranked = sorted(zip(cas, results), key=lambda item: ("data" in item[1], item[1].get('risk_score', 0)), reverse=True)
+    rows = []
+    for rank, (ca, result) in enumerate(ranked, 1):
+        curve = curves.get(ca)
+        on_chain = ""
+        if curve is not None:
+            on_chain = " • 🎓 completed" if curve.complete else f" • {format_number(curve.market_cap_sol, 0)} SOL MC • 📈 {curve.progress:.0%}"
+        if "data" not in result:
+            rows.append(f"{rank}. ❓ `{shorten_address(ca)}` — {result.get('reason', 'unavailable')}{on_chain}")
+            continue
+        risk_emoji, _, _ = risk_band(result['risk_score'])
+        top10 = result['holders'].get('top10_share')
+        concentration = f" • top10 {top10:.0%}" if top10 is not None else ""
+        rows.append(
+            f"{rank}. {risk_emoji} `{shorten_address(ca)}` — **{result['risk_score']:g}/{RISK_MAX_SCORE:g}**"
+            f" • MC ${format_number(result['data'].get('marketCap', 0), 0)}{concentration}{on_chain}"
+            f" • 🕒 {format_age(time.time() - result['fetched_at'])}"
+        )
+
+    report = f"**🎯 RUG CHECK — {len(cas)} TOKENS (riskiest first)**\n\n" + "\n".join(rows)
+    report += "\n\n💡 Use `/rugcheck <CA>` on one token for the full report"
+    await message_updater.edit(msg, report, parse_mode='Markdown')
 
 async def auto(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Enhanced auto-sell with detailed status reporting"""
     user_id = update.effective_user.id
     
-    if not check_admin_access(user_id) or not check_rate_limit(user_id):
+    if not check_admin_access(user_id) or not check_rate_limit(user_id, "auto"):
         await update.message.reply_text("❌ Access denied or rate limited.")
         return
         
@@ -1206,7 +3248,8 @@ async def auto(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "• Analyzes token for rug pull risks\n"
             "• Automatically sells if HIGH RISK detected\n"
             "• Protects your investment\n\n"
-            "**Example:** `/auto 7xKXtg2CW87d97TXJSDpbD5jBkheTqA83TZRuJosgAsU`\n\n"
+            "**Example:** `/auto 7xKXtg2CW87d97TXJSDpbD5jBkheTqA83TZRuJosgAsU`\n"
+            "**Stop:** `/auto <CONTRACT_ADDRESS> stop`\n\n"
             "💡 Use `/help auto` for detailed explanation",
             parse_mode='Markdown'
         )
@@ -1219,80 +3262,62 @@ async def auto(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(f"{message}\n\n💡 Use `/help auto` for examples")
         return
     
-    msg = await update.message.reply_text("⏳ **Activating Auto-Sell Protection...**\n\n🔍 Analyzing current risk level...", parse_mode='Markdown')
+    if len(context.args) > 1 and context.args[1].lower() == "stop":
+        if watchlist.remove(update.effective_chat.id, ca):
+            if not any(e["mint"] == ca for e in watchlist.all()):
+                unwatch_mint_onchain(ca)
+            await update.message.reply_text(f"🛑 Stopped monitoring `{shorten_address(ca)}`", parse_mode='Markdown')
+        else:
+            await update.message.reply_text(f"ℹ️ `{shorten_address(ca)}` is not being monitored", parse_mode='Markdown')
+        return
+    
+    msg = await message_updater.reply(update.message, "⏳ **Activating Auto-Sell Protection...**\n\n🔍 Analyzing current risk level...", parse_mode='Markdown')
     
     try:
-        async with throttler:
-            rug_result = await check_rug_risk(ca)
+        # Auto-sell decisions are made on live pump.fun data, never on a cached copy
+        rug_result = (await check_rug_risk_many([ca], max_age=0))[0]
         
-        if rug_result["risk"]:
+        if not rug_result.get("data"):
+            # No data to score (API down, circuit open) - never sell blind, re-check soon
+            watchlist.add(update.effective_chat.id, ca, rug_result.get('risk_score', 0), time.time() + WATCH_INTERVAL_MIN)
+            watch_mint_onchain(ca)
+            await message_updater.edit(
+                msg,
+                f"⚠️ **AUTO-SELL PROTECTION: RISK CHECK UNAVAILABLE**\n\n"
+                f"**🎯 Token:** `{shorten_address(ca)}`\n"
+                f"**❓ Reason:** {rug_result.get('reason', 'No token data')}\n\n"
+                f"No sell was made. The token is being monitored and will be re-checked in {WATCH_INTERVAL_MIN:.0f}s.\n\n"
+                f"**🛑 Stop monitoring:** `/auto {ca} stop`",
+                parse_mode='Markdown'
+            )
+        elif rug_result["risk"]:
             # High risk detected - execute emergency sell
-            await msg.edit_text("⏳ **Auto-Sell Protection...**\n\n🚨 HIGH RISK DETECTED! Executing emergency sell...", parse_mode='Markdown')
-            
-            wallet = get_or_create_wallet_for_token(ca)
-            token_balance, _ = await get_token_balance(ca, wallet["address"])
-            
-            if token_balance <= 0:
-                no_tokens_report = f"""
-🛡️ **AUTO-SELL PROTECTION ACTIVATED**
-
-**🚨 HIGH RISK DETECTED** - But no tokens to sell
-
-**🎯 Token:** `{shorten_address(ca)}`
-**📊 Risk Score:** {rug_result.get('risk_score', 0)}/5
-**💰 Token Balance:** 0 tokens
-
-**🚨 Risk Factors:**
-"""
-                for factor in rug_result.get('factors', ['Unknown']):
-                    no_tokens_report += f"• {factor}\n"
-                
-                no_tokens_report += "\n✅ **No action needed** - you don't hold any tokens."
-                
-                await msg.edit_text(no_tokens_report, parse_mode='Markdown')
-                return
-            
+            message_updater.progress(msg, "⏳ **Auto-Sell Protection...**\n\n🚨 HIGH RISK DETECTED! Executing emergency sell...", parse_mode='Markdown')
             try:
-                tx_link = await execute_sell(ca, token_balance, wallet["private_key"])
-                
-                emergency_report = f"""
-🛡️ **EMERGENCY SELL EXECUTED!**
-
-**🚨 RUG PULL PROTECTION ACTIVATED**
-
-**📊 TRADE DETAILS:**
-🪙 **Token:** `{shorten_address(ca)}`
-📊 **Risk Score:** {rug_result.get('risk_score', 0)}/5
-💸 **Sold:** {format_number(token_balance, 0)} tokens (100%)
-👛 **Wallet:** `{shorten_address(wallet['address'])}`
-
-**🚨 DETECTED RISKS:**
-"""
-                for factor in rug_result.get('factors', ['Unknown']):
-                    emergency_report += f"• {factor}\n"
-                
-                emergency_report += f"""
-**🔗 TRANSACTION:**
-[📋 View on Solscan]({tx_link})
-
-🛡️ **Your investment has been protected!**
-"""
-                
-                await msg.edit_text(emergency_report, parse_mode='Markdown')
-                
+                text, parse_mode = await emergency_sell(ca, rug_result)
             except Exception as e:
-                await msg.edit_text(
-                    f"🚨 **HIGH RISK DETECTED** but emergency sell failed!\n\n"
-                    f"❌ Error: {str(e)}\n\n"
-                    f"💡 **URGENT:** Manually sell with `/dump {ca} 100`"
-                )
+                # Balance unknown - keep watching and retry the sell soon
+                logger.error(f"Auto-sell of {ca} postponed, balance read failed: {e}")
+                watchlist.add(update.effective_chat.id, ca, rug_result.get('risk_score', 0), time.time() + WATCH_INTERVAL_MIN)
+                watch_mint_onchain(ca)
+                text, parse_mode = (
+                    f"🚨 **HIGH RISK DETECTED** but your balance could not be read.\n\n"
+                    f"The token is being monitored and the sell will be retried in {WATCH_INTERVAL_MIN:.0f}s.\n\n"
+                    f"💡 To sell now: `/dump {ca} 100`"
+                ), 'Markdown'
+            await message_updater.edit(msg, text, parse_mode=parse_mode)
         else:
             # Low risk - monitoring mode
+            risk_score = rug_result.get('risk_score', 0)
+            interval = watch_interval(risk_score)
+            watchlist.add(update.effective_chat.id, ca, risk_score, time.time() + interval)
+            watch_mint_onchain(ca)
+
             safe_report = f"""
 ✅ **AUTO-SELL PROTECTION: MONITORING MODE**
 
 **🎯 Token:** `{shorten_address(ca)}`
-**📊 Risk Level:** LOW ({rug_result.get('risk_score', 0)}/5)
+**📊 Risk Level:** LOW ({risk_score:g}/{RISK_MAX_SCORE:g})
 **🛡️ Status:** ACTIVE MONITORING
 
 **📊 CURRENT METRICS:**
@@ -1305,21 +3330,22 @@ async def auto(update: Update, context: ContextTypes.DEFAULT_TYPE):
             
             safe_report += f"""
 **🛡️ PROTECTION FEATURES:**
-• Continuous risk monitoring
+• Continuous risk monitoring (next check in {interval:.0f}s, faster as risk rises)
 • Automatic sell on rug detection  
 • Multi-factor risk analysis
 • Instant emergency response
 
 **💡 Your tokens are safe!** The bot will automatically sell if risk factors increase.
 
-**🔄 Run `/auto {ca}` again anytime to re-check status.**
+**🛑 Stop monitoring:** `/auto {ca} stop`
 """
             
-            await msg.edit_text(safe_report, parse_mode='Markdown')
+            await message_updater.edit(msg, safe_report, parse_mode='Markdown')
         
     except Exception as e:
         logger.error(f"Auto command error: {e}")
-        await msg.edit_text(
+        await message_updater.edit(
+            msg,
             f"❌ **Auto-Sell Protection Failed**\n\n"
             f"Error: {str(e)}\n\n"
             f"💡 Try again in a few seconds or use manual commands:\n"
@@ -1327,29 +3353,645 @@ async def auto(update: Update, context: ContextTypes.DEFAULT_TYPE):
             f"• `/dump {ca} 100` - Emergency sell if needed"
         )
 
+async def emergency_sell(ca: str, rug_result: Dict[str, Any]) -> tuple[str, Optional[str]]:
+    """Sell the whole position after a rug signal; returns (report, parse_mode).
+
+    Raises if the balance cannot be read: an unknown position is not an
+    empty one, so the caller keeps watching the mint.
+    """
+    wallet = await wallet_for_token(ca)
+    position = await read_token_position(ca, wallet["address"])
+    token_balance = position.amount
+    
+    if token_balance <= 0:
+        no_tokens_report = f"""
+🛡️ **AUTO-SELL PROTECTION ACTIVATED**
+
+**🚨 HIGH RISK DETECTED** - But no tokens to sell
+
+**🎯 Token:** `{shorten_address(ca)}`
+**📊 Risk Score:** {rug_result.get('risk_score', 0):g}/{RISK_MAX_SCORE:g}
+**💰 Token Balance:** 0 tokens
+
+**🚨 Risk Factors:**
+"""
+        for factor in rug_result.get('factors', ['Unknown']):
+            no_tokens_report += f"• {factor}\n"
+        
+        no_tokens_report += "\n✅ **No action needed** - you don't hold any tokens."
+        return no_tokens_report, 'Markdown'
+    
+    try:
+        tx_link = await execute_sell(ca, token_balance, wallet["private_key"])
+        
+        emergency_report = f"""
+🛡️ **EMERGENCY SELL EXECUTED!**
+
+**🚨 RUG PULL PROTECTION ACTIVATED**
+
+**📊 TRADE DETAILS:**
+🪙 **Token:** `{shorten_address(ca)}`
+📊 **Risk Score:** {rug_result.get('risk_score', 0):g}/{RISK_MAX_SCORE:g}
+💸 **Sold:** {format_number(position.ui_amount, 2)} tokens (100%)
+👛 **Wallet:** `{shorten_address(wallet['address'])}`
+
+**🚨 DETECTED RISKS:**
+"""
+        for factor in rug_result.get('factors', ['Unknown']):
+            emergency_report += f"• {factor}\n"
+        
+        emergency_report += f"""
+**🔗 TRANSACTION:**
+[📋 View on Solscan]({tx_link})
+
+🛡️ **Your investment has been protected!**
+"""
+        return emergency_report, 'Markdown'
+        
+    except Exception as e:
+        return (
+            f"🚨 **HIGH RISK DETECTED** but emergency sell failed!\n\n"
+            f"❌ Error: {str(e)}\n\n"
+            f"💡 **URGENT:** Manually sell with `/dump {ca} 100`"
+        ), None
+
+# 👁️ Continuous /auto monitoring
+def watch_interval(risk_score: float) -> float:
+    """Seconds until the next check: WATCH_INTERVAL_MAX at score 0, tightening to WATCH_INTERVAL_MIN"""
+    ratio = min(max(risk_score / RISK_MAX_SCORE, 0.0), 1.0)
+    return WATCH_INTERVAL_MAX - (WATCH_INTERVAL_MAX - WATCH_INTERVAL_MIN) * ratio
+
+async def watch_sweep(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """JobQueue tick: re-score every due mint in one batched, concurrency-limited sweep"""
+    due = watchlist.due(time.time())
+    if due:
+        with metrics.timer("job", job="watchlist"):
+            await rescore_watched(context.bot, due)
+
+async def rescore_watched(bot, entries: List[Dict[str, Any]]) -> None:
+    """Re-score the given watchlist entries, one check per mint, and act on the result"""
+    by_mint: Dict[str, List[Dict[str, Any]]] = {}
+    for entry in entries:
+        by_mint.setdefault(entry["mint"], []).append(entry)
+
+    # Auto-sell decisions are made on live pump.fun data, never on a cached copy
+    scored = dict(zip(by_mint, await check_rug_risk_many(list(by_mint), concurrency=WATCH_CONCURRENCY, max_age=0)))
+
+    async def rescore(mint: str, entries: List[Dict[str, Any]]) -> None:
+        result = scored[mint]
+        risk_score = result.get('risk_score', 0)
+
+        # Only sell on scored data; an API outage just gets re-checked soon
+        if result["risk"] and result.get("data"):
+            try:
+                text, parse_mode = await emergency_sell(mint, result)
+            except Exception as e:
+                logger.error(f"Auto-sell of {mint} postponed, balance read failed: {e}")
+                for entry in entries:
+                    watchlist.update(entry["chat_id"], mint, risk_score, time.time() + WATCH_INTERVAL_MIN)
+                return
+            for entry in entries:
+                watchlist.remove(entry["chat_id"], mint)
+                try:
+                    await message_updater.send(bot, entry["chat_id"], text, parse_mode=parse_mode)
+                except Exception as e:
+                    logger.error(f"Auto-sell notification to {entry['chat_id']} failed: {e}")
+            if not any(e["mint"] == mint for e in watchlist.all()):
+                unwatch_mint_onchain(mint)
+            return
+
+        interval = WATCH_INTERVAL_MIN if "data" not in result else watch_interval(risk_score)
+        for entry in entries:
+            watchlist.update(entry["chat_id"], mint, risk_score, time.time() + interval)
+
+    results = await asyncio.gather(
+        *(rescore(mint, entries) for mint, entries in by_mint.items()), return_exceptions=True
+    )
+    for mint, result in zip(by_mint, results):
+        if isinstance(result, Exception):
+            logger.error(f"Watchlist check for {mint} failed: {result}")
+
+# 🔔 Push-based rug signals over the RPC websocket
+class AccountWatcher:
+    """Multiplexes account and logs subscriptions for watched mints over one websocket.
+
+    For each mint it watches the mint account, its pump.fun bonding curve and
+    the curve's token account (the liquidity), plus logs mentioning the mint.
+    It reconnects with backoff and resubscribes everything on its own; bursts
+    of notifications for a mint are debounced into one on_change call.
+    """
+
+    def __init__(self, url: str, on_change: Callable[[str], Awaitable[None]]):
+        self.url = url
+        self.on_change = on_change
+        self._wanted: Dict[tuple, str] = {}
+        self._sub_by_key: Dict[tuple, int] = {}
+        self._key_by_sub: Dict[int, tuple] = {}
+        self._pending: Dict[int, tuple] = {}
+        self._scheduled: Dict[str, asyncio.Task] = {}
+        self._next_id = 0
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _keys(mint: str) -> List[tuple]:
+        mint_key = Pubkey.from_string(mint)
+        curve = derive_bonding_curve(mint_key)
+        return [
+            ("account", mint),
+            ("account", str(curve)),
+            ("account", str(derive_ata(curve, mint_key))),
+            ("logs", mint),
+        ]
+
+    def watch(self, mint: str) -> None:
+        for key in self._keys(mint):
+            if key not in self._wanted:
+                self._wanted[key] = mint
+                if self._ws is not None and not self._ws.closed:
+                    asyncio.create_task(self._subscribe(key))
+
+    def unwatch(self, mint: str) -> None:
+        for key in self._keys(mint):
+            self._wanted.pop(key, None)
+            sub_id = self._sub_by_key.pop(key, None)
+            if sub_id is not None:
+                self._key_by_sub.pop(sub_id, None)
+                if self._ws is not None and not self._ws.closed:
+                    method = "accountUnsubscribe" if key[0] == "account" else "logsUnsubscribe"
+                    asyncio.create_task(self._send(method, [sub_id]))
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        for task in list(self._scheduled.values()):
+            task.cancel()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _send(self, method: str, params: list) -> int:
+        self._next_id += 1
+        await self._ws.send_json({"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params})
+        return self._next_id
+
+    async def _subscribe(self, key: tuple) -> None:
+        kind, target = key
+        if kind == "account":
+            request_id = await self._send(
+                "accountSubscribe", [target, {"encoding": "base64", "commitment": RPC_COMMITMENT}]
+            )
+        else:
+            request_id = await self._send("logsSubscribe", [{"mentions": [target]}, {"commitment": RPC_COMMITMENT}])
+        self._pending[request_id] = key
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                session = http_pool.get(self.url)
+                async with session.ws_connect(self.url, heartbeat=30) as ws:
+                    self._ws = ws
+                    self._sub_by_key.clear()
+                    self._key_by_sub.clear()
+                    self._pending.clear()
+                    for key in list(self._wanted):
+                        await self._subscribe(key)
+                    logger.info(f"Websocket monitor connected with {len(self._wanted)} subscriptions")
+                    delay = 1.0
+                    async for message in ws:
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            self._handle(json.loads(message.data))
+                        elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Websocket monitor error: {e}")
+            finally:
+                self._ws = None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WS_RECONNECT_MAX_DELAY)
+
+    def _handle(self, payload: Dict[str, Any]) -> None:
+        if "id" in payload:
+            key = self._pending.pop(payload["id"], None)
+            if key is None:
+                return
+            if "result" in payload and key in self._wanted:
+                self._sub_by_key[key] = payload["result"]
+                self._key_by_sub[payload["result"]] = key
+            elif "error" in payload:
+                logger.warning(f"Subscription {key} rejected: {payload['error']}")
+            return
+        if payload.get("method", "").endswith("Notification"):
+            key = self._key_by_sub.get(payload.get("params", {}).get("subscription"))
+            mint = self._wanted.get(key) if key else None
+            if mint and mint not in self._scheduled:
+                self._scheduled[mint] = asyncio.create_task(self._fire(mint))
+
+    async def _fire(self, mint: str) -> None:
+        try:
+            await asyncio.sleep(WS_RESCORE_DEBOUNCE)
+        finally:
+            self._scheduled.pop(mint, None)
+        try:
+            await self.on_change(mint)
+        except Exception as e:
+            logger.error(f"On-chain re-score for {mint} failed: {e}")
+
+account_watcher: Optional[AccountWatcher] = None
+
+def watch_mint_onchain(mint: str) -> None:
+    if account_watcher is not None:
+        account_watcher.watch(mint)
+
+def unwatch_mint_onchain(mint: str) -> None:
+    if account_watcher is not None:
+        account_watcher.unwatch(mint)
+
+# 📈 Runtime statistics for /stats and /metrics
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss figures for every cache on the hot path"""
+    ata = derive_ata.cache_info()
+    coin_hits = metrics.counter("coin_cache", result="fresh") + metrics.counter("coin_cache", result="stale")
+    coin_misses = metrics.counter("coin_cache", result="miss")
+    caches = {
+        "rug_results": rug_cache.stats(),
+        "holder_stats": holder_stats.stats(),
+        "mint_decimals": mint_decimals.stats(),
+        "ata": {"size": ata.currsize, "hits": ata.hits, "misses": ata.misses},
+        "coin_metadata": {"hits": coin_hits, "misses": coin_misses,
+                          "stale": metrics.counter("coin_cache", result="stale")},
+    }
+    for stats in caches.values():
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / total if total else 0.0
+    return caches
+
+def metric_gauges(app: Application) -> List[tuple[str, Dict[str, str], float]]:
+    """Point-in-time values exported next to the histograms and counters"""
+    gauges = [
+        ("pending_updates", {}, app.update_queue.qsize()),
+        ("loop_lag_last_seconds", {}, loop_lag.last),
+        ("rate_limit_tracked_users", {}, len(user_limiter)),
+        ("watchlist_entries", {}, len(watchlist.all())),
+        ("background_tasks", {}, len(background)),
+    ]
+    for name, stats in cache_stats().items():
+        gauges.append(("cache_hits", {"cache": name}, stats["hits"]))
+        gauges.append(("cache_misses", {"cache": name}, stats["misses"]))
+    for key, value in hedge_budget.stats().items():
+        gauges.append(("hedged_reads", {"stat": key}, value))
+    for node in rpc_health.summary():
+        labels = {"upstream": upstream_label(node["url"])}
+        gauges.append(("rpc_node_healthy", labels, 1 if node["healthy"] else 0))
+        if node["latency_ms"] is not None:
+            gauges.append(("rpc_node_latency_ms", labels, node["latency_ms"]))
+    for name, breaker in breakers.items():
+        gauges.append(("circuit_open", {"upstream": upstream_label(name)}, 1 if breaker.state != CircuitBreaker.CLOSED else 0))
+    return gauges
+
+def format_stats(app: Application) -> str:
+    """Markdown report of handler/upstream latencies, cache hit rates and loop lag"""
+    def ms(seconds: Optional[float]) -> str:
+        return "—" if seconds is None else f"{seconds * 1000:.0f}ms"
+
+    def section(title: str, summary: Dict[str, Dict[str, Any]], prefix: str = "") -> str:
+        if not summary:
+            return f"**{title}**\nNo calls yet\n"
+        rows = [f"`{prefix}{name}` {ms(s['p50'])} / {ms(s['p95'])} · {s['count']} · {s['errors']}" for name, s in summary.items()]
+        return f"**{title}** (p50 / p95 · calls · errors)\n" + "\n".join(rows) + "\n"
+
+    lag = metrics.summary("loop_lag", by="").get("", {})
+    hedges = hedge_budget.stats()
+    rate_limited = sum(v for (name, _), v in metrics.counters.items() if name == "rate_limited")
+    caches = "\n".join(
+        f"`{name}` {stats['hit_rate']:.0%} of {stats['hits'] + stats['misses']:.0f}" for name, stats in cache_stats().items()
+    )
+    return (
+        "📈 **BOT STATS**\n\n"
+        + section("⏱️ Handlers", metrics.summary("handler", by="handler"), prefix="/") + "\n"
+        + section("🌐 Upstreams", metrics.summary("upstream", by="upstream")) + "\n"
+        + section("🚰 Quota waits", metrics.summary("quota_wait", by="upstream")) + "\n"
+        + section("📨 Telegram API", metrics.summary("telegram", by="method")) + "\n"
+        + f"**🗄️ Cache hit rates**\n{caches}\n\n"
+        + f"**🐢 Event loop lag:** p50 {ms(lag.get('p50'))} · p95 {ms(lag.get('p95'))} · max {ms(lag.get('max'))}\n"
+        + f"**🔁 Hedged reads:** {hedges['sent']} sent · {hedges['won']} won · {hedges['wasted']} wasted · {hedges['denied']} denied\n"
+        + f"**🚦 Rate limited:** {rate_limited:.0f} requests · {len(user_limiter)} users tracked\n"
+        + f"**📬 Pending updates:** {app.update_queue.qsize()} · {metrics.counter('updates_dropped'):.0f} dropped (chat backlog full)"
+    )
+
+async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Admin-only runtime statistics"""
+    if not ADMIN_USER_ID or not check_admin_access(update.effective_user.id):
+        await update.message.reply_text("❌ Access denied. /stats is only available to the admin (set ADMIN_USER_ID).")
+        return
+    await update.message.reply_text(format_stats(context.application), parse_mode='Markdown')
+
+# 🚦 Concurrent update processing
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Runs updates concurrently while keeping each chat's updates in order.
+
+    An update first waits for its chat's lock, then for one of
+    `max_workers` slots, so a chat with a backlog only ever occupies one
+    slot and cannot starve other chats. PTB's own semaphore is bypassed:
+    it would be held while waiting on the chat lock, letting one flooding
+    chat fill every slot. A chat with `max_pending` updates already
+    queued has further updates dropped: each drop is counted in
+    updates_dropped, and the first one of a backlog is logged and answered
+    with a short notice. Handlers slower than `slow_after` seconds are logged.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, slow_after: float):
+        if max_workers < 1 or max_pending < 1:
+            raise ValueError("UPDATE_CONCURRENCY and UPDATE_MAX_PENDING must be at least 1")
+        # PTB hands updates over concurrently only when max_concurrent_updates > 1;
+        # the real bound on running handlers is self._workers, so 1 worker still needs 2 here
+        super().__init__(max_concurrent_updates=max(max_workers, 2))
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.slow_after = slow_after
+        self._workers = asyncio.Semaphore(max_workers)
+        self._chat_locks: Dict[int, asyncio.Lock] = {}
+        self._chat_waiters: Dict[int, int] = {}
+        self._chat_dropped: Dict[int, int] = {}
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        self._chat_locks.clear()
+        self._chat_waiters.clear()
+        self._chat_dropped.clear()
+
+    async def process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        await self.do_process_update(update, coroutine)
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        chat = update.effective_chat if isinstance(update, Update) else None
+        if chat is None:
+            await self._run(update, coroutine)
+            return
+
+        if self._chat_waiters.get(chat.id, 0) >= self.max_pending:
+            metrics.inc("updates_dropped")
+            self._chat_dropped[chat.id] = self._chat_dropped.get(chat.id, 0) + 1
+            if self._chat_dropped[chat.id] == 1:
+                logger.warning(f"Dropping {describe_update(update)}: {self.max_pending} updates already queued for this chat")
+                background.spawn(("busy_notice", chat.id), lambda: self._notify_busy(update))
+            if asyncio.iscoroutine(coroutine):
+                coroutine.close()
+            return
+
+        lock = self._chat_locks.setdefault(chat.id, asyncio.Lock())
+        self._chat_waiters[chat.id] = self._chat_waiters.get(chat.id, 0) + 1
+        try:
+            async with lock:
+                await self._run(update, coroutine)
+        finally:
+            self._chat_waiters[chat.id] -= 1
+            if not self._chat_waiters[chat.id]:
+                del self._chat_waiters[chat.id]
+                del self._chat_locks[chat.id]
+                dropped = self._chat_dropped.pop(chat.id, 0)
+                if dropped:
+                    logger.warning(f"Dropped {dropped} updates from chat {chat.id}: more than {self.max_pending} were queued")
+
+    async def _notify_busy(self, update: Update) -> None:
+        if update.effective_message is None:
+            return
+        try:
+            await message_updater.reply(
+                update.effective_message,
+                "⏳ Too many commands queued - this one was skipped. Please wait for the earlier ones to finish.",
+            )
+        except Exception as e:
+            logger.warning(f"Busy notice for {describe_update(update)} failed: {e}")
+
+    async def _run(self, update: object, coroutine: Awaitable[Any]) -> None:
+        async with self._workers:
+            started = time.monotonic()
+            try:
+                await coroutine
+            finally:
+                elapsed = time.monotonic() - started
+                if elapsed >= self.slow_after:
+                    logger.warning(f"Slow handler: {describe_update(update)} took {elapsed:.1f}s")
+
+def describe_update(update: object) -> str:
+    """Short label for logs: chat and command text"""
+    if isinstance(update, Update):
+        chat_id = update.effective_chat.id if update.effective_chat else None
+        if update.effective_message and update.effective_message.text:
+            return f"chat {chat_id} '{update.effective_message.text.split()[0]}'"
+        if update.callback_query:
+            return f"chat {chat_id} callback '{update.callback_query.data}'"
+        return f"chat {chat_id} update {update.update_id}"
+    return type(update).__name__
+
+# 🌍 Embedded web server: Telegram webhook, health and metrics endpoints
+class BotWebServer:
+    """aiohttp server serving /healthz, optionally /metrics and, in webhook mode, the Telegram webhook.
+
+    Webhook requests must carry the secret token Telegram was given in
+    setWebhook; updates are handed straight to the application's update
+    queue so the response goes back without waiting for the handler.
+    """
+
+    def __init__(self, app: Application, host: str, port: int, webhook_path: Optional[str] = None, secret: str = "",
+                 metrics_endpoint: bool = False):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.webhook_path = webhook_path
+        self.secret = secret
+        self.metrics_endpoint = metrics_endpoint
+        self.started_at = time.monotonic()
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self) -> None:
+        server = web.Application()
+        server.router.add_get("/healthz", self.handle_health)
+        if self.metrics_endpoint:
+            server.router.add_get("/metrics", self.handle_metrics)
+        if self.webhook_path:
+            server.router.add_post(self.webhook_path, self.handle_update)
+        self._runner = web.AppRunner(server, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Web server listening on {self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def handle_update(self, request: web.Request) -> web.Response:
+        token = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+        if not hmac.compare_digest(token.encode(), self.secret.encode()):
+            logger.warning(f"Rejected webhook request from {request.remote}: bad secret token")
+            return web.Response(status=403)
+        try:
+            update = Update.de_json(await request.json(), self.app.bot)
+        except Exception as e:
+            logger.warning(f"Malformed webhook payload: {e}")
+            return web.Response(status=400)
+        await self.app.update_queue.put(update)
+        return web.Response()
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        healthy = self.app.running
+        return web.json_response({
+            "status": "ok" if healthy else "starting",
+            "mode": BOT_MODE,
+            "uptime_s": round(time.monotonic() - self.started_at),
+            "pending_updates": self.app.update_queue.qsize(),
+            "watchlist": len(watchlist.all()),
+        }, status=200 if healthy else 503)
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        body = metrics.render_prometheus(metric_gauges(self.app))
+        return web.Response(body=body.encode(), headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+web_server: Optional[BotWebServer] = None
+
 # Main application
+async def post_init(app: Application) -> None:
+    """Open long-lived upstream connections once the bot is initialized"""
+    global web_server
+    if BOT_MODE == "webhook" or HEALTH_ENDPOINT or METRICS_ENDPOINT:
+        webhook_path = WEBHOOK_PATH if BOT_MODE == "webhook" else None
+        web_server = BotWebServer(app, WEB_HOST, PORT, webhook_path, WEBHOOK_SECRET, METRICS_ENDPOINT)
+        await web_server.start()
+    loop_lag.start()
+    await http_pool.start(RPC_NODES + [PUMP_API_URL, JITO_BUNDLE_URL])
+    rpc_health.start()
+    # Opens the wallet store (and imports a legacy wallets.json) off the event loop
+    logger.info(f"Warmed ATA cache with {await asyncio.to_thread(warm_ata_cache)} positions")
+
+    if RPC_WS_URL:
+        global account_watcher
+
+        async def on_change(mint: str) -> None:
+            # Chain moved first: drop the cached score and re-check right away
+            rug_cache.invalidate(mint)
+            entries = [e for e in watchlist.all() if e["mint"] == mint]
+            if entries:
+                await rescore_watched(app.bot, entries)
+
+        account_watcher = AccountWatcher(RPC_WS_URL, on_change)
+        for entry in watchlist.all():
+            account_watcher.watch(entry["mint"])
+        account_watcher.start()
+
+async def post_shutdown(app: Application) -> None:
+    """Stop background tasks and close pooled upstream connections on shutdown"""
+    if web_server is not None:
+        await web_server.stop()
+    if account_watcher is not None:
+        await account_watcher.stop()
+    await rpc_health.stop()
+    await loop_lag.stop()
+    await background.cancel_all()
+    logger.info(f"Hedged RPC reads: {hedge_budget.stats()}")
+    await rpc_pool.close()
+    await http_pool.close()
+    wallet_store.close()
+    watchlist.close()
+    coin_cache.close()
+
+def build_application(token: Optional[str] = None, request: Optional[BaseRequest] = None) -> Application:
+    """Application with every handler and background job registered.
+
+    `request` replaces the Bot API transport (benchmarks use a local stub);
+    by default Telegram calls go through the timed InstrumentedRequest.
+    """
+    app = (
+        Application.builder()
+        .token(token or TOKEN)
+        .request(request or InstrumentedRequest(connection_pool_size=256))
+        .concurrent_updates(ChatOrderedUpdateProcessor(UPDATE_CONCURRENCY, UPDATE_MAX_PENDING, SLOW_HANDLER_SECONDS))
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
+    
+    # Add command handlers, each timed into the per-handler histogram
+    app.add_handler(CommandHandler("start", timed_handler("start", start)))
+    app.add_handler(CommandHandler("help", timed_handler("help", help_command)))
+    app.add_handler(CommandHandler("examples", timed_handler("examples", examples_command)))
+    app.add_handler(CommandHandler("pump", timed_handler("pump", pump)))
+    app.add_handler(CommandHandler("repump", timed_handler("repump", pump)))  # Reuse pump handler
+    app.add_handler(CommandHandler("dump", timed_handler("dump", dump)))
+    app.add_handler(CommandHandler("balance", timed_handler("balance", balance)))
+    app.add_handler(CommandHandler("rugcheck", timed_handler("rugcheck", rugcheck)))
+    app.add_handler(CommandHandler("auto", timed_handler("auto", auto)))
+    app.add_handler(CommandHandler("stats", timed_handler("stats", stats_command)))
+    app.add_handler(CallbackQueryHandler(timed_handler("callback", callback_query_handler)))
+    app.job_queue.run_repeating(watch_sweep, interval=WATCH_TICK_SECONDS, first=WATCH_TICK_SECONDS, name="watchlist")
+    return app
+
+async def run_webhook(app: Application) -> None:
+    """Webhook mode: same lifecycle as run_polling, with updates pushed to the embedded server"""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await app.initialize()
+    try:
+        await post_init(app)
+        await app.bot.set_webhook(
+            url=WEBHOOK_URL.rstrip("/") + WEBHOOK_PATH,
+            secret_token=web_server.secret,
+            allowed_updates=Update.ALL_TYPES,
+            drop_pending_updates=True,
+        )
+        await app.start()
+        logger.info(f"🚀 Receiving updates via webhook at {WEBHOOK_URL.rstrip('/')}{WEBHOOK_PATH}")
+        await stop.wait()
+        # Stop accepting updates before the application stops processing them
+        await web_server.stop()
+        await app.stop()
+    finally:
+        await app.shutdown()
+        await post_shutdown(app)
+
 def main():
     """Enhanced main function with better error handling"""
+    global WEBHOOK_SECRET
     if not TOKEN:
         logger.error("TELEGRAM_TOKEN not found in environment variables")
         return
+    if BOT_MODE not in ("polling", "webhook"):
+        logger.error(f"Unknown BOT_MODE '{BOT_MODE}', use 'polling' or 'webhook'")
+        return
+    if BOT_MODE == "webhook":
+        if not WEBHOOK_URL:
+            logger.error("WEBHOOK_URL is required when BOT_MODE=webhook")
+            return
+        if not WEBHOOK_SECRET:
+            WEBHOOK_SECRET = secrets.token_urlsafe(32)
+            logger.info("WEBHOOK_SECRET not set, generated a random one for this run")
     
-    app = Application.builder().token(TOKEN).build()
-    
-    # Add command handlers
-    app.add_handler(CommandHandler("start", start))
-    app.add_handler(CommandHandler("help", help_command))
-    app.add_handler(CommandHandler("examples", examples_command))
-    app.add_handler(CommandHandler("pump", pump))
-    app.add_handler(CommandHandler("repump", pump))  # Reuse pump handler
-    app.add_handler(CommandHandler("dump", dump))
-    app.add_handler(CommandHandler("balance", balance))
-    app.add_handler(CommandHandler("rugcheck", rugcheck))
-    app.add_handler(CommandHandler("auto", auto))
-    app.add_handler(CallbackQueryHandler(callback_query_handler))
-    
+    app = build_application()
+    log_listener = setup_queue_logging()
     logger.info("🚀 PumpShield Pro Bot started with enhanced user experience")
-    app.run_polling(drop_pending_updates=True)
+    try:
+        if BOT_MODE == "webhook":
+            asyncio.run(run_webhook(app))
+        else:
+            app.run_polling(drop_pending_updates=True)
+    finally:
+        if log_listener is not None:
+            log_listener.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,8 +4,21 @@ Test script for PumpShield Bot improvements
 """
 
 import asyncio
+import json
+import sqlite3
+import struct
 import sys
 import os
+import tempfile
+import time
+import logging
+from datetime import datetime
+from types import SimpleNamespace
+
+import aiohttp
+from aiohttp import web
+from telegram import Chat, Message, Update
+from telegram.error import RetryAfter
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -14,9 +27,200 @@ from main_improved import (
     validate_ca_address, 
     validate_sol_amount, 
     validate_percentage,
-    check_rug_risk,
     get_working_rpc
 )
+import main_user_friendly as bot
+
+async def start_slow_rpc(delay: float, port: int = 18899) -> web.AppRunner:
+    """Local JSON-RPC stand-in that answers balance reads after `delay` seconds"""
+    wallet_account = {"lamports": 1_000_000_000, "owner": "11111111111111111111111111111111",
+                      "data": ["", "base64"], "executable": False, "rentEpoch": 0, "space": 0}
+
+    async def handle(request):
+        body = await request.json()
+        await asyncio.sleep(delay)
+        # Wallet exists with 1 SOL, its token account and the mint do not
+        keys = body["params"][0]
+        value = [wallet_account] + [None] * (len(keys) - 1) if body["method"] == "getMultipleAccounts" else None
+        return web.json_response({"jsonrpc": "2.0", "id": body["id"], "result": {"context": {"slot": 1}, "value": value}})
+
+    app = web.Application()
+    app.router.add_post("/", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+async def test_event_loop_responsiveness():
+    """Slow RPC reads must not block other work on the event loop"""
+    print("4️⃣ Testing Event Loop Responsiveness During Slow RPC:")
+    runner = await start_slow_rpc(delay=1.0)
+    rpc_url = "http://127.0.0.1:18899/"
+    original_health = bot.rpc_health
+    bot.rpc_health = bot.RpcHealthTracker([rpc_url], 10, 3, 0.3)
+
+    max_gap = 0.0
+    stop = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal max_gap
+        last = time.monotonic()
+        while not stop.is_set():
+            await asyncio.sleep(0.01)
+            now = time.monotonic()
+            max_gap = max(max_gap, now - last)
+            last = now
+
+    ticker = asyncio.create_task(heartbeat())
+    try:
+        started = time.monotonic()
+        results = await asyncio.gather(*(
+            bot.get_token_balance("So11111111111111111111111111111111111111112", str(bot.Keypair().pubkey()))
+            for _ in range(5)
+        ))
+        elapsed = time.monotonic() - started
+    finally:
+        stop.set()
+        await ticker
+        await bot.rpc_pool.close()
+        await runner.cleanup()
+        bot.rpc_health = original_health
+
+    assert all(sol == 1.0 for _, sol in results), results
+    assert max_gap < 0.2, f"event loop stalled for {max_gap:.3f}s"
+    print(f"   5 concurrent slow reads took {elapsed:.2f}s, max loop stall {max_gap * 1000:.0f}ms ✅")
+    print()
+
+async def test_update_fairness():
+    """A chat with a backlog of slow commands must not hold up other chats, and keeps its own order"""
+    print("5️⃣ Testing Concurrent Update Processing Fairness:")
+    processor = bot.ChatOrderedUpdateProcessor(max_workers=3, max_pending=100, slow_after=0.25)
+    slow_logs = []
+
+    class Capture(logging.Handler):
+        def emit(self, record):
+            if "Slow handler" in record.getMessage():
+                slow_logs.append(record.getMessage())
+
+    capture = Capture()
+    bot.logger.addHandler(capture)
+    finished = []
+    running = 0
+    max_running = 0
+    started = time.monotonic()
+
+    async def handler(chat_id: int, n: int, duration: float):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(duration)
+        running -= 1
+        finished.append((chat_id, n, time.monotonic() - started))
+
+    def make_update(update_id: int, chat_id: int) -> Update:
+        chat = Chat(chat_id, Chat.PRIVATE)
+        return Update(update_id, message=Message(update_id, datetime.now(), chat, text=f"/cmd{update_id}"))
+
+    # Chat 1 floods slow commands, chat 2 sends two slower ones, chat 3 one quick command last
+    load = [(1, 0.2)] * 4 + [(2, 0.3)] * 2 + [(3, 0.01)]
+    async with processor:
+        tasks = []
+        for update_id, (chat_id, duration) in enumerate(load):
+            n = sum(1 for c, _ in load[:update_id] if c == chat_id)
+            coroutine = handler(chat_id, n, duration)
+            tasks.append(asyncio.create_task(processor.process_update(make_update(update_id, chat_id), coroutine)))
+        await asyncio.gather(*tasks)
+    bot.logger.removeHandler(capture)
+
+    quick_done = next(t for c, _, t in finished if c == 3)
+    for chat_id in (1, 2):
+        order = [n for c, n, _ in finished if c == chat_id]
+        assert order == sorted(order), f"chat {chat_id} out of order: {order}"
+    assert max_running <= 3, f"{max_running} handlers ran at once"
+    assert quick_done < 0.1, f"quick command waited {quick_done:.2f}s behind other chats"
+    assert len(slow_logs) == 2, slow_logs
+    print(f"   Per-chat order kept, max {max_running} concurrent, quick command done after {quick_done * 1000:.0f}ms ✅")
+    print(f"   {len(slow_logs)} slow-handler warnings logged ✅")
+
+    # A flood far past max_pending from one chat must not delay another chat
+    processor = bot.ChatOrderedUpdateProcessor(max_workers=3, max_pending=5, slow_after=10)
+    finished.clear()
+    drop_logs, notices = [], []
+    dropped_before = bot.metrics.counter("updates_dropped")
+
+    class DropCapture(logging.Handler):
+        def emit(self, record):
+            if "Dropp" in record.getMessage():
+                drop_logs.append(record.getMessage())
+
+    class NoticeRecorder:
+        async def reply(self, message, text, parse_mode=None):
+            notices.append((message.chat_id, text))
+
+    drop_capture = DropCapture()
+    bot.logger.addHandler(drop_capture)
+    original_updater, bot.message_updater = bot.message_updater, NoticeRecorder()
+    flood = [make_update(update_id, 1) for update_id in range(300)]
+    other = make_update(300, 2)
+    started = time.monotonic()
+    async with processor:
+        tasks = [
+            asyncio.create_task(processor.process_update(update, handler(1, n, 0.05)))
+            for n, update in enumerate(flood)
+        ]
+        tasks.append(asyncio.create_task(processor.process_update(other, handler(2, 0, 0.01))))
+        await asyncio.gather(*tasks)
+        await asyncio.sleep(0.01)
+    bot.logger.removeHandler(drop_capture)
+    bot.message_updater = original_updater
+
+    quick_done = next(t for c, _, t in finished if c == 2)
+    flood_done = [n for c, n, _ in finished if c == 1]
+    assert quick_done < 0.1, f"other chat waited {quick_done:.2f}s behind a 300-update flood"
+    assert flood_done == [0, 1, 2, 3, 4], flood_done
+    assert bot.metrics.counter("updates_dropped") - dropped_before == 295
+    assert len(drop_logs) == 2, drop_logs  # first drop, then the summary once the chat drained
+    assert len(notices) == 1 and notices[0][0] == 1, notices
+    print(f"   300-update flood: {len(flood_done)} run, rest dropped, other chat done after {quick_done * 1000:.0f}ms ✅")
+    print("   295 drops counted, logged and answered with one busy notice ✅")
+    print()
+
+async def test_progress_edits():
+    """Rapid progress edits collapse into few API calls; flood waits are retried, not raised"""
+    print("6️⃣ Testing Debounced Progress Edits:")
+    updater = bot.MessageUpdater(debounce=0.2, chat_rate=5, chat_burst=2, global_rate=100, max_retries=2)
+    calls = []
+
+    class FakeMessage:
+        chat_id = 42
+        message_id = 7
+        flood_once = True
+
+        async def edit_text(self, text, parse_mode=None):
+            if text == "done" and self.flood_once:
+                self.flood_once = False
+                raise RetryAfter(1)
+            calls.append((text, time.monotonic()))
+
+    msg = FakeMessage()
+    started = time.monotonic()
+    for step in range(10):
+        updater.progress(msg, f"step {step}")
+        await asyncio.sleep(0.03)
+    await asyncio.sleep(0.3)
+    updater.progress(msg, "step 9")  # unchanged: skipped
+    await asyncio.sleep(0.3)
+    await updater.edit(msg, "done")
+    elapsed = time.monotonic() - started
+
+    texts = [text for text, _ in calls]
+    assert texts[-1] == "done", texts
+    assert "step 9" in texts and texts.count("step 9") == 1, texts
+    assert len(texts) <= 4, f"{len(texts)} edits for 11 updates: {texts}"
+    assert elapsed >= 1.0, "RetryAfter was not waited out"
+    print(f"   11 updates sent as {len(texts)} edits ({', '.join(texts)}) ✅")
+    print(f"   Flood wait retried, final edit delivered after {elapsed:.1f}s ✅")
+    print()
 
 async def test_improvements():
     """Test key improvements"""
@@ -59,15 +263,19 @@ async def test_improvements():
     print("3️⃣ Testing Enhanced Rug Detection:")
     try:
         # Test with SOL token (should be low risk)
-        rug_result = await check_rug_risk("So11111111111111111111111111111111111111112")
+        rug_result = await bot.check_rug_risk("So11111111111111111111111111111111111111112")
         print(f"   SOL rug check completed")
         print(f"   Risk: {'High' if rug_result['risk'] else 'Low'}")
-        print(f"   Risk Score: {rug_result.get('risk_score', 0)}/5")
+        print(f"   Risk Score: {rug_result.get('risk_score', 0):g}/{bot.RISK_MAX_SCORE:g}")
         if rug_result.get('factors'):
             print(f"   Risk Factors: {', '.join(rug_result['factors'])}")
         print("   ✅")
     except Exception as e:
         print(f"   Rug detection test failed: {e}")
+    finally:
+        # Holder refreshes and pooled sessions belong to this event loop
+        await bot.background.cancel_all()
+        await bot.http_pool.close()
     
     print()
     print("🎉 All improvements tested!")
@@ -78,5 +286,296 @@ async def test_improvements():
     print("   • Rate limiting prevents abuse")
     print("   • Better error handling improves user experience")
 
+async def test_single_flight():
+    """Concurrent callers of one key share a single call; cancelling one waiter leaves the others served"""
+    print("7️⃣ Testing Single-Flight Coalescing:")
+    flight = bot.SingleFlight()
+    calls = 0
+
+    async def lookup():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "data"
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream down")
+
+    for fn, expected in ((lookup, "data"), (failing, RuntimeError)):
+        calls = 0
+        cancelled = asyncio.create_task(flight.do("coin", fn))
+        waiter = asyncio.create_task(flight.do("coin", fn))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        try:
+            outcome = await waiter
+        except RuntimeError as e:
+            outcome = type(e)
+        assert cancelled.cancelled()
+        assert outcome == expected, outcome
+        assert calls == 1, f"{fn.__name__} ran {calls} times"
+        assert len(flight) == 0
+        print(f"   {fn.__name__}: one call, remaining waiter got {getattr(outcome, '__name__', outcome)!r} after the other was cancelled ✅")
+    print()
+
+def token_account_bytes(mint, owner, amount: int, state: int = 1) -> bytes:
+    """165-byte SPL token account: mint, owner, amount, no delegate, state, rest zeroed"""
+    data = bytes(mint) + bytes(owner) + struct.pack("<Q", amount) + struct.pack("<I", 0) + bytes(32) + bytes([state])
+    return data + bytes(bot.TOKEN_ACCOUNT_SIZE - len(data))
+
+async def test_account_decoders():
+    """SPL layouts decode to the right fields, and a compact (dataSlice) read finds the same amount"""
+    print("8️⃣ Testing SPL Account Decoders:")
+    mint = bot.Keypair().pubkey()
+    wallet = bot.Keypair().pubkey()
+    authority = bot.Keypair().pubkey()
+
+    account = bot.decode_token_account(token_account_bytes(mint, wallet, 1_234_567_890))
+    assert account == bot.TokenAccountInfo(mint, wallet, 1_234_567_890, "initialized"), account
+    assert bot.decode_token_account(token_account_bytes(mint, wallet, 5, state=2)).state == "frozen"
+
+    mint_data = struct.pack("<I", 1) + bytes(authority) + struct.pack("<QB?", 10**15, 6, True) + struct.pack("<I", 0) + bytes(32)
+    assert len(mint_data) == bot.MINT_ACCOUNT_SIZE
+    info = bot.decode_mint_account(mint_data)
+    assert info == bot.MintInfo(10**15, 6, True, authority, None), info
+    for decode, size in ((bot.decode_token_account, 164), (bot.decode_mint_account, 81)):
+        try:
+            decode(bytes(size))
+            raise AssertionError(f"{decode.__name__} accepted {size} bytes")
+        except ValueError:
+            pass
+    print("   Token account and mint fields decoded, short data rejected ✅")
+
+    # The same balance read in full, then compact once decimals are cached
+    ata = bot.derive_ata(wallet, mint)
+    full_accounts = {
+        wallet: SimpleNamespace(lamports=2_500_000_000, owner=bot.SYSTEM_PROGRAM_ID, data=b""),
+        ata: SimpleNamespace(lamports=0, owner=bot.TOKEN_PROGRAM_ID, data=token_account_bytes(mint, wallet, 987_654_321)),
+        mint: SimpleNamespace(lamports=0, owner=bot.TOKEN_PROGRAM_ID, data=mint_data),
+    }
+    slices = []
+
+    async def fake_accounts_at(pubkeys, data_slice=None):
+        slices.append(data_slice)
+        accounts = [full_accounts.get(key) for key in pubkeys]
+        if data_slice is not None:
+            end = data_slice.offset + data_slice.length
+            accounts = [a and SimpleNamespace(lamports=a.lamports, owner=a.owner, data=a.data[data_slice.offset:end])
+                        for a in accounts]
+        return 1, accounts
+
+    real_accounts_at = bot.get_multiple_accounts_at
+    bot.get_multiple_accounts_at = fake_accounts_at
+    try:
+        full = (await bot.get_token_balances([(str(mint), str(wallet))]))[0]
+        compact = (await bot.get_token_balances([(str(mint), str(wallet))]))[0]
+    finally:
+        bot.get_multiple_accounts_at = real_accounts_at
+
+    assert slices[0] is None and slices[1] is not None, slices
+    assert full.amount == compact.amount == 987_654_321, (full, compact)
+    assert full.decimals == compact.decimals == 6 and compact.sol == 2.5
+    print(f"   Compact read of a {slices[1].length}-byte slice found {compact.ui_amount:g} tokens, same as the full read ✅")
+    print()
+
+async def test_watch_failed_balance():
+    """A rug signal whose balance read fails keeps the mint watched and retries soon, instead of reporting nothing to sell"""
+    print("9️⃣ Testing Watchlist Rug Signal With a Failed Balance Read:")
+    mint = str(bot.Keypair().pubkey())
+    wallet = str(bot.Keypair().pubkey())
+    sells, unwatched, sent = [], [], []
+
+    async def risky(cas, concurrency, max_age):
+        return [{"risk": True, "risk_score": 5.0, "factors": ["LP not locked"], "data": {"mint": ca}} for ca in cas]
+
+    async def rpc_down(pairs):
+        raise bot.CircuitOpenError("All RPC circuits are open")
+
+    async def execute_sell(*args):
+        sells.append(args)
+
+    class FakeBot:
+        async def send_message(self, chat_id, text, **kwargs):
+            sent.append((chat_id, text))
+
+    patched = {
+        "watchlist": bot.WatchlistStore(os.path.join(tempfile.mkdtemp(), "watch.db")),
+        "check_rug_risk_many": risky,
+        "get_token_balances": rpc_down,
+        "execute_sell": execute_sell,
+        "get_or_create_wallet_for_token": lambda ca: {"address": wallet, "private_key": ""},
+        "unwatch_mint_onchain": unwatched.append,
+    }
+    originals = {name: getattr(bot, name) for name in patched}
+    for name, value in patched.items():
+        setattr(bot, name, value)
+    try:
+        bot.watchlist.add(7, mint, 1.0, time.time() - 1)
+        before = time.time()
+        await bot.rescore_watched(FakeBot(), bot.watchlist.due(time.time()))
+        entries = bot.watchlist.all()
+    finally:
+        bot.watchlist.close()
+        for name, value in originals.items():
+            setattr(bot, name, value)
+
+    assert len(entries) == 1 and entries[0]["mint"] == mint, entries
+    assert entries[0]["next_check"] - before <= bot.WATCH_INTERVAL_MIN + 1, entries
+    assert not sells and not unwatched and not sent, (sells, unwatched, sent)
+    print(f"   Mint still watched, re-check in {entries[0]['next_check'] - before:.0f}s, no sell or 'no tokens' report ✅")
+    print()
+
+def test_wallet_migration():
+    """wallets.json imports into SQLite with a working mint index; failed or repeated imports lose and duplicate nothing"""
+    print("🔟 Testing Wallet Store Migration:")
+    folder = tempfile.mkdtemp()
+    db_path = os.path.join(folder, "wallets.db")
+    json_path = os.path.join(folder, "wallets.json")
+    wallets = [
+        {"address": str(bot.Keypair().pubkey()), "private_key": f"key{i}", "used_for": [f"mint{i}", "shared"],
+         "created_at": "2024-01-01T00:00:00"}
+        for i in range(3)
+    ]
+
+    def write_json(entries):
+        with open(json_path, "w") as f:
+            json.dump(entries, f)
+
+    def addresses(store):
+        return sorted(w["address"] for w in store.all())
+
+    # A malformed entry rolls the whole import back and keeps wallets.json for the next start
+    write_json(wallets[:2] + [{"address": wallets[2]["address"]}])
+    store = bot.WalletStore(db_path, json_path)
+    try:
+        store.all()
+        raise AssertionError("malformed wallets.json was accepted")
+    except KeyError:
+        pass
+    store.close()
+    assert os.path.exists(json_path)
+    assert sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM wallets").fetchone()[0] == 0
+    print("   Failed import rolled back, wallets.json kept ✅")
+
+    write_json(wallets)
+    store = bot.WalletStore(db_path, json_path)
+    assert addresses(store) == sorted(w["address"] for w in wallets)
+    for i, wallet in enumerate(wallets):
+        found = store.get_for_token(f"mint{i}")
+        assert found["address"] == wallet["address"] and found["private_key"] == wallet["private_key"], found
+    assert store.get_for_token("shared")["address"] == wallets[0]["address"], "first wallet listing a mint must win"
+    assert store.get_for_token("unknown") is None
+    created = store.get_or_create("new-mint")
+    assert store.get_for_token("new-mint")["address"] == created["address"]
+    store.close()
+    assert not os.path.exists(json_path) and os.path.exists(json_path + ".migrated")
+    print(f"   {len(wallets)} wallets imported, every mint found through the index ✅")
+
+    # Interrupted before the rename: the same file comes back, plus a wallet added since
+    extra = {"address": str(bot.Keypair().pubkey()), "private_key": "key3", "used_for": ["mint3"]}
+    write_json(wallets + [extra])
+    store = bot.WalletStore(db_path, json_path)
+    assert addresses(store) == sorted([w["address"] for w in wallets] + [extra["address"], created["address"]])
+    assert store.get_for_token("mint3")["address"] == extra["address"]
+    store.close()
+    rows = sqlite3.connect(db_path).execute("SELECT COUNT(*), COUNT(DISTINCT address) FROM wallets").fetchone()
+    assert rows == (5, 5), rows
+    print("   Repeated import added the missing wallet without duplicates ✅")
+    print()
+
+async def test_hedged_reads():
+    """Hedges stay within budget, never fire on our own quota wait, and a refused hedge leaves failover intact"""
+    print("1️⃣1️⃣ Testing Hedged RPC Reads:")
+    calls = []
+    behaviour = {
+        "http://slow.test/": (0.3, None),
+        "http://fast.test/": (0.01, None),
+        "http://broken.test/": (0.1, RuntimeError("node down")),
+        "http://spare.test/": (0.01, None),
+    }
+
+    async def operation(rpc):
+        calls.append(rpc)
+        delay, error = behaviour[rpc]
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return rpc
+
+    def use_nodes(*urls):
+        bot.rpc_health = bot.RpcHealthTracker(list(urls), 10, 3, 0.3)
+        bot.rpc_health.hedge_delay = lambda url: 0.05
+
+    original_health, original_budget = bot.rpc_health, bot.hedge_budget
+    try:
+        # Slow primary: the first two reads are hedged to the fast node, then the budget runs out
+        use_nodes("http://slow.test/", "http://fast.test/")
+        bot.hedge_budget = bot.HedgeBudget(per_minute=2)
+        results = [await bot.rpc_call(operation, hedge=True) for _ in range(4)]
+        assert results == ["http://fast.test/"] * 2 + ["http://slow.test/"] * 2, results
+        assert bot.hedge_budget.stats()["sent"] == 2 and bot.hedge_budget.denied == 2, bot.hedge_budget.stats()
+        print(f"   Budget of 2: {bot.hedge_budget.stats()['won']} hedges won, {bot.hedge_budget.denied} refused ✅")
+
+        # No budget: the failing primary fails over to the next node, which the refused hedge must not consume
+        use_nodes("http://broken.test/", "http://fast.test/", "http://spare.test/")
+        bot.hedge_budget = bot.HedgeBudget(per_minute=0)
+        calls.clear()
+        result = await bot.rpc_call(operation, hedge=True)
+        assert result == "http://fast.test/" and calls == ["http://broken.test/", "http://fast.test/"], calls
+        print("   Refused hedge: failover still went to the next-ranked node ✅")
+
+        # A request held back by our own quota limiter is not hedged
+        use_nodes("http://fast.test/", "http://spare.test/")
+        bot.hedge_budget = bot.HedgeBudget(per_minute=10)
+        bot.upstream_limits["http://fast.test/"] = bot.AsyncTokenBucket(rate=5, capacity=1)
+        await bot.upstream_limits["http://fast.test/"].acquire()
+        calls.clear()
+        result = await bot.rpc_call(operation, hedge=True)
+        assert result == "http://fast.test/" and bot.hedge_budget.sent == 0, (calls, bot.hedge_budget.stats())
+        print("   200ms quota wait did not trigger a hedge ✅")
+    finally:
+        bot.rpc_health, bot.hedge_budget = original_health, original_budget
+        for url in behaviour:
+            bot.upstream_limits.pop(url, None)
+            bot.breakers.pop(url, None)
+    print()
+
+async def test_webhook_secret():
+    """Webhook updates are only accepted with the secret token given to setWebhook"""
+    print("1️⃣2️⃣ Testing Webhook Secret Token:")
+    app = SimpleNamespace(bot=None, update_queue=asyncio.Queue(), running=True)
+    server = bot.BotWebServer(app, "127.0.0.1", 18897, "/telegram", secret="s3cret-token")
+    await server.start()
+    url = "http://127.0.0.1:18897/telegram"
+    payload = {"update_id": 1, "message": {"message_id": 1, "date": 0, "text": "/start",
+                                           "chat": {"id": 7, "type": "private"}}}
+    statuses = {}
+    try:
+        async with aiohttp.ClientSession() as session:
+            for label, headers in (("missing", {}),
+                                   ("wrong", {"X-Telegram-Bot-Api-Secret-Token": "s3cret-tokeN"}),
+                                   ("correct", {"X-Telegram-Bot-Api-Secret-Token": "s3cret-token"})):
+                async with session.post(url, json=payload, headers=headers) as response:
+                    statuses[label] = response.status
+    finally:
+        await server.stop()
+
+    assert statuses == {"missing": 403, "wrong": 403, "correct": 200}, statuses
+    assert app.update_queue.qsize() == 1 and app.update_queue.get_nowait().update_id == 1
+    print("   Missing and wrong token rejected (403), correct token queued the update ✅")
+    print()
+
 if __name__ == "__main__":
-    asyncio.run(test_improvements())
\ No newline at end of file
+    asyncio.run(test_improvements())
+    asyncio.run(test_event_loop_responsiveness())
+    asyncio.run(test_update_fairness())
+    asyncio.run(test_progress_edits())
+    asyncio.run(test_single_flight())
+    asyncio.run(test_account_decoders())
+    asyncio.run(test_watch_failed_balance())
+    test_wallet_migration()
+    asyncio.run(test_hedged_reads())
+    asyncio.run(test_webhook_secret())
\ No newline at end of file